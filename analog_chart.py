@@ -1,7 +1,14 @@
+from functools import partial
 from PyQt6 import QtCore, QtWidgets
 import pyqtgraph as pg
 import numpy as np
 
+try:
+    import OpenGL  # noqa: F401  (PyOpenGL; lets pyqtgraph skip the QPainterPath raster path)
+    _HAVE_GL = True
+except Exception:
+    _HAVE_GL = False
+
 class AnalogChartWindow(QtWidgets.QMainWindow):
     traceClicked = QtCore.pyqtSignal(int)
     requestScale = QtCore.pyqtSignal(int)
@@ -35,11 +42,17 @@ class AnalogChartWindow(QtWidgets.QMainWindow):
         outer.addWidget(ctrl)
 
         self.plots = []
+        self._plot_items = []  # plt.getPlotItem() per row, looked up once
+        self._view_boxes = []  # and its ViewBox
         self.curves = []
-        self._y_locked = [False] * len(names)
-        self._y_ranges = [(None, None)] * len(names)
+        self._y_locked = np.zeros(len(names), dtype=bool)
+        self._y_ranges = np.full((len(names), 2), np.nan)  # fixed (ymin, ymax) per channel; NaN = never fixed
         self._big = None
         self._headers = []  # (chk_auto, sp_min, sp_max, btn_apply, lbl_chan)
+        self._titles = []   # last title set per plot
+        self._buf = np.empty((len(names), 0), dtype=np.float32)  # per-channel display rows reused across frames
+        self._last_frame = None  # (n, first x, last x) of the last window drawn
+        self._vis_mask = (1 << len(names)) - 1  # bit i set -> AIi curve shown and updated
 
         for i, nm in enumerate(names):
             row = QtWidgets.QWidget()
@@ -92,6 +105,8 @@ class AnalogChartWindow(QtWidgets.QMainWindow):
 
             # Plot
             plt = pg.PlotWidget()
+            if _HAVE_GL:
+                plt.useOpenGL(True)
             pi = plt.getPlotItem()
             pi.showGrid(x=True, y=True, alpha=0.2)
             if i < len(self._names) - 1:
@@ -103,11 +118,14 @@ class AnalogChartWindow(QtWidgets.QMainWindow):
             unit = f" [{self._units[i]}]" if (i < len(self._units) and self._units[i]) else ""
             # CENTER TITLE: config trace name only
             pi.setTitle(f"{nm}{unit}")
+            self._titles.append(f"{nm}{unit}")
 
             # Disable built-in context menu
-            pi.getViewBox().setMenuEnabled(False)
+            vb = pi.getViewBox()
+            vb.setMenuEnabled(False)
 
-            curve = plt.plot([], [], pen=pg.mkPen(width=2), name=nm, clickable=True)
+            curve = plt.plot([], [], pen=pg.mkPen(width=2), name=nm, connect='finite', clickable=True)  # NaN = gap
+            curve.curve.setCacheMode(QtWidgets.QGraphicsItem.CacheMode.DeviceCoordinateCache)
             try:
                 curve.setClipToView(True)
                 curve.setDownsampling(auto=True, method='peak')
@@ -121,6 +139,8 @@ class AnalogChartWindow(QtWidgets.QMainWindow):
             # wire header actions
             chk_auto.toggled.connect(lambda checked, idx=i: self._on_auto_toggled(idx, checked))
             btn_apply.clicked.connect(lambda _=False, idx=i, smin=sp_min, smax=sp_max: self._on_apply(idx, smin.value(), smax.value()))
+            sp_min.editingFinished.connect(partial(self._apply_if_manual, i, sp_min, sp_max))
+            sp_max.editingFinished.connect(partial(self._apply_if_manual, i, sp_min, sp_max))
 
             ymin, ymax = self._view_range_of(pi)
             if not np.isfinite(ymin) or not np.isfinite(ymax):
@@ -131,6 +151,8 @@ class AnalogChartWindow(QtWidgets.QMainWindow):
             sp_max.setDisabled(True)
 
             self.plots.append(plt)
+            self._plot_items.append(pi)
+            self._view_boxes.append(vb)
             self.curves.append(curve)
             self._headers.append((chk_auto, sp_min, sp_max, btn_apply, lbl_chan))
 
@@ -183,26 +205,65 @@ class AnalogChartWindow(QtWidgets.QMainWindow):
             nm = self._names[i] if i < len(self._names) else f"AI{i}"
             unit = self._units[i] if (i < len(self._units) and self._units[i]) else ""
             unit_txt = f" [{unit}]" if unit else ""
-            plt.getPlotItem().setTitle(f"{nm}{unit_txt}")
+            title = f"{nm}{unit_txt}"
+            if title != self._titles[i]:  # setTitle relayouts the plot; skip unchanged ones
+                plt.getPlotItem().setTitle(title)
+                self._titles[i] = title
+
+    def set_visible_channels(self, channels):
+        """Show only the given AI channels; hidden ones are skipped by set_data."""
+        mask = 0
+        for ch in channels:
+            if 0 <= ch < len(self.curves):
+                mask |= 1 << ch
+        changed = mask ^ self._vis_mask
+        if not changed:
+            return
+        # only touch curves whose visibility flips; setVisible invalidates the scene
+        while changed:
+            b = changed & -changed
+            changed ^= b
+            i = b.bit_length() - 1
+            self.curves[i].setVisible(bool(mask & b))
+        self._vis_mask = mask
+        self._last_frame = None  # newly shown curves need the next frame even if x is unchanged
 
     def set_data(self, x, ys):
         x = np.asarray(x, dtype=float)
         n = x.shape[0]
-        for i, y in enumerate(ys):
-            y_arr = np.asarray(y, dtype=float)
-            if y_arr.shape[0] != n:
-                if y_arr.shape[0] > n:
-                    y_arr = y_arr[-n:]
-                else:
-                    pad = np.full(n - y_arr.shape[0], np.nan, dtype=float)
-                    y_arr = np.concatenate([pad, y_arr])
-            self.curves[i].setData(x, y_arr)
-
-            if self._y_locked[i] and self._y_ranges[i][0] is not None:
-                pi = self.plots[i].getPlotItem()
-                pi.enableAutoRange(axis='y', enable=False)
-                ymin, ymax = self._y_ranges[i]
-                pi.setYRange(float(ymin), float(ymax), padding=0.0)
+
+        # Same window as last frame (no new samples): nothing to redraw
+        frame = (n, float(x[0]), float(x[-1])) if n else (0, 0.0, 0.0)
+        if frame == self._last_frame:
+            return
+        self._last_frame = frame
+
+        if self._buf.shape[1] < n:
+            self._buf = np.empty((len(self.curves), max(n, 2 * self._buf.shape[1])), dtype=np.float32)
+        buf = self._buf[:, :n]
+        relock = self._y_locked & np.isfinite(self._y_ranges[:, 0])
+        m = self._vis_mask
+        while m:
+            b = m & -m
+            m ^= b
+            i = b.bit_length() - 1
+            if i >= len(ys):
+                break
+            # copy the last n samples into this channel's reusable row, NaN-padded on the left
+            y_arr = np.asarray(ys[i])
+            k = min(n, y_arr.shape[0])
+            row = buf[i]
+            row[:n - k] = np.nan
+            row[n - k:] = y_arr[y_arr.shape[0] - k:]
+            self.curves[i].setData(x, row)
+
+            # re-apply a locked range only if the view has drifted from it
+            if relock[i]:
+                pi = self._plot_items[i]
+                ymin, ymax = self._y_ranges[i].tolist()
+                if pi.getAxis('left').range != [ymin, ymax]:
+                    pi.enableAutoRange(axis='y', enable=False)
+                    pi.setYRange(ymin, ymax, padding=0.0)
 
             # keep header boxes in sync if manual
             chk_auto, sp_min, sp_max, _, _ = self._headers[i]
@@ -213,10 +274,6 @@ class AnalogChartWindow(QtWidgets.QMainWindow):
                     sp_min.setValue(float(ymin)); sp_max.setValue(float(ymax))
                     sp_min.blockSignals(False); sp_max.blockSignals(False)
 
-            # after creating sp_min, sp_max (and still inside the loop for channel i)
-            sp_min.editingFinished.connect(lambda idx=i, smin=sp_min, smax=sp_max: self._apply_if_manual(idx, smin, smax))
-            sp_max.editingFinished.connect(lambda idx=i, smin=sp_min, smax=sp_max: self._apply_if_manual(idx, smin, smax))
-
     def _apply_if_manual(self, idx, smin, smax):
         # Only apply if Auto is OFF for this channel
         chk_auto = self._headers[idx][0]
@@ -225,18 +282,18 @@ class AnalogChartWindow(QtWidgets.QMainWindow):
 
     def autoscale(self, idx):
         self._y_locked[idx] = False
-        pi = self.plots[idx].getPlotItem()
+        pi = self._plot_items[idx]
         pi.enableAutoRange(axis='y', enable=True)
 
     def set_fixed_scale(self, idx, ymin, ymax):
         self._y_locked[idx] = True
-        self._y_ranges[idx] = (float(ymin), float(ymax))
-        pi = self.plots[idx].getPlotItem()
+        self._y_ranges[idx] = (ymin, ymax)
+        pi = self._plot_items[idx]
         pi.enableAutoRange(axis='y', enable=False)
         pi.setYRange(float(ymin), float(ymax), padding=0.0)
 
     def get_y_range(self, idx):
-        return tuple(self.plots[idx].getViewBox().viewRange()[1])
+        return tuple(self._view_boxes[idx].viewRange()[1])
 
     @staticmethod
     def _view_range_of(plot_item):
@@ -1,16 +1,62 @@
 # combined_chart.py
+from dataclasses import dataclass
+from functools import partial
+
 from PyQt6 import QtCore, QtWidgets
 import pyqtgraph as pg
 import numpy as np
 
+from plot_kernels import m4_downsample, pack_do_lanes, do_step_path, warm_up
+
+try:
+    import OpenGL  # noqa: F401  (PyOpenGL; lets pyqtgraph skip the QPainterPath raster path)
+    _HAVE_GL = True
+except Exception:
+    _HAVE_GL = False
+
+
+@dataclass(slots=True)
+class SectionRefs:
+    """Live references to one analog section's per-row state (AI or AO), bound once."""
+    ctrl_attr: str         # name of the section's top control-bar dict on the window
+    plots: list            # PlotItem per row
+    headers: list          # (chk_auto, sp_min, sp_max, btn_apply, lbl_chan) per row
+    locked: np.ndarray     # bool per row
+    ranges: np.ndarray     # (rows, 2) fixed (ymin, ymax); NaN = never fixed
+
+
+class _PrepSignals(QtCore.QObject):
+    done = QtCore.pyqtSignal(object)  # dict of display-ready arrays, or None on failure
+    failed = QtCore.pyqtSignal(str)   # why the frame was dropped
+
+
+class _Prep(QtCore.QRunnable):
+    """Runs CombinedChartWindow._prep_frame on a pool thread and posts the result back."""
+    def __init__(self, fn, snap, signals):
+        super().__init__()
+        self._fn = fn
+        self._snap = snap
+        self._signals = signals
+
+    def run(self):
+        try:
+            out = self._fn(self._snap)
+        except Exception as e:
+            # drop the frame (the next set_data starts a fresh job), but report why:
+            # a bug in _prep_frame would otherwise just freeze the chart
+            self._signals.failed.emit(f"{type(e).__name__}: {e}")
+            out = None
+        self._signals.done.emit(out)  # queued to the GUI thread
+
 
 class CombinedChartWindow(QtWidgets.QMainWindow):
     spanChanged = QtCore.pyqtSignal(float)  # <— NEW
+    renderError = QtCore.pyqtSignal(str)    # a frame could not be prepared (message for the owner's log)
     """
     Big window with:
       - AI rows (8) with per-row Auto / Ymin / Ymax / Apply (headers hidden; controlled via top bar)
       - AO rows (2) same controls (default fixed 0..10V; top bar)
-      - DO block (1 plot with 8 step traces, fixed scale, no pan/zoom)
+      - DO block (1 plot, 8 step lanes drawn as one curve, fixed scale, no pan/zoom)
     DO block is in a resizable bottom pane via QSplitter.
     External API:
       set_ai_names_units(names, units)
@@ -45,6 +91,7 @@ class CombinedChartWindow(QtWidgets.QMainWindow):
         self.sp_span.setSingleStep(0.01)
         self.sp_span.setValue(5.0)
         self.sp_span.valueChanged.connect(lambda v: self.spanChanged.emit(float(v)))
+        self.sp_span.valueChanged.connect(self._rebuild_ticks)
         span_layout.addWidget(self.sp_span)
         span_layout.addStretch(1)
         outer.addWidget(span_bar)
@@ -63,25 +110,31 @@ class CombinedChartWindow(QtWidgets.QMainWindow):
         # Top control bar for AI (one bar, select which AIx to edit)
         top_v.addWidget(self._make_top_ctrl("AI", len(self._ai_names), self._ai_names))
 
-        self.ai_rows = []          # list[QWidget] for stretch
-        self.ai_plots = []         # list[PlotWidget]
+        # All AI rows share one GraphicsLayoutWidget (one scene, one view) with X linked
+        self.ai_glw = pg.GraphicsLayoutWidget()
+        if _HAVE_GL:
+            self.ai_glw.useOpenGL(True)
+        self.ai_plots = []         # list[PlotItem]
         self.ai_curves = []        # list[PlotDataItem]
-        self.ai_locked = [False] * len(self._ai_names)
-        self.ai_ranges = [(None, None)] * len(self._ai_names)
+        self.ai_locked = np.zeros(len(self._ai_names), dtype=bool)
+        self.ai_ranges = np.full((len(self._ai_names), 2), np.nan)  # (ymin, ymax); NaN = never fixed
         self.ai_headers = []       # list of tuples (chk_auto, sp_min, sp_max, btn_apply, lbl_chan)
+        self._sections = {"AI": SectionRefs("_ai_ctrl", self.ai_plots, self.ai_headers,
+                                            self.ai_locked, self.ai_ranges)}
 
         for i, nm in enumerate(self._ai_names):
-            row, plt, curve, hdr = self._make_analog_row(
+            plt, curve, hdr = self._make_analog_row(
+                self.ai_glw,
                 kind="AI",
                 idx=i,
                 name=nm,
                 unit=(self._ai_units[i] if i < len(self._ai_units) else "")
             )
-            top_v.addWidget(row)
-            self.ai_rows.append(row)
             self.ai_plots.append(plt)
             self.ai_curves.append(curve)
             self.ai_headers.append(hdr)
+        top_v.addWidget(self.ai_glw, stretch=len(self.ai_plots))
+        self._ai_titles = [""] * len(self.ai_plots)  # last title set per row
 
         # ---------- AO section ----------
         ao_label = QtWidgets.QLabel("Analog Outputs")
@@ -92,14 +145,20 @@ class CombinedChartWindow(QtWidgets.QMainWindow):
         top_v.addWidget(self._make_top_ctrl("AO", min(2, len(self._ao_names)), self._ao_names,
                                             default_range=self._ao_default_range))
 
-        self.ao_rows, self.ao_plots, self.ao_curves = [], [], []
-        self.ao_locked = [True, True]  # default fixed
-        self.ao_ranges = [self._ao_default_range, self._ao_default_range]
+        self.ao_glw = pg.GraphicsLayoutWidget()
+        if _HAVE_GL:
+            self.ao_glw.useOpenGL(True)
+        self.ao_plots, self.ao_curves = [], []
+        self.ao_locked = np.ones(2, dtype=bool)  # default fixed
+        self.ao_ranges = np.array([self._ao_default_range, self._ao_default_range], dtype=float)
         self.ao_headers = []
+        self._sections["AO"] = SectionRefs("_ao_ctrl", self.ao_plots, self.ao_headers,
+                                           self.ao_locked, self.ao_ranges)
 
         ao_count = min(2, len(self._ao_names))
         for i in range(ao_count):
-            row, plt, curve, hdr = self._make_analog_row(
+            plt, curve, hdr = self._make_analog_row(
+                self.ao_glw,
                 kind="AO",
                 idx=i,
                 name=self._ao_names[i],
@@ -107,11 +166,11 @@ class CombinedChartWindow(QtWidgets.QMainWindow):
                 start_locked=True,
                 start_range=self._ao_default_range
             )
-            top_v.addWidget(row)
-            self.ao_rows.append(row)
             self.ao_plots.append(plt)
             self.ao_curves.append(curve)
             self.ao_headers.append(hdr)
+        top_v.addWidget(self.ao_glw, stretch=max(1, len(self.ao_plots)))
+        self._ao_titles = [""] * len(self.ao_plots)
 
         # ========= Bottom section (DO with label) =========
         do_container = QtWidgets.QWidget()
@@ -125,7 +184,9 @@ class CombinedChartWindow(QtWidgets.QMainWindow):
 
         self.do_plot = pg.PlotWidget()
         self.do_plot.setMinimumHeight(220)  # keep usable when splitter is small
-        dpi = self.do_plot.getPlotItem()
+        if _HAVE_GL:
+            self.do_plot.useOpenGL(True)
+        dpi = self._do_pi = self.do_plot.getPlotItem()  # kept for the per-frame X range / ticks
         # fixed scale + no mouse
         dpi.showAxis('bottom', show=True)  # DO keeps its X axis visible
         vb = dpi.getViewBox()
@@ -137,14 +198,16 @@ class CombinedChartWindow(QtWidgets.QMainWindow):
 
         self.do_amp = 0.85
         # lanes top→bottom (7..0), same spacing as your 1.3 window
-        self.do_offsets = np.arange(8, dtype=float)[::-1]
+        self.do_offsets = np.arange(8, dtype=np.float32)[::-1]
         # fix y
         y_min = self.do_offsets[-1] - 0.75
         y_max = self.do_offsets[0] + 0.75
         dpi.setYRange(y_min, y_max, padding=0.0)
 
-        self.do_curves = [self.do_plot.plot([], [], stepMode=True, pen=pg.mkPen(width=2))
-                          for _ in range(8)]
+        # All 8 lanes are one curve; a per-point connect mask breaks the line between lanes
+        self.do_curve = self.do_plot.plot([], [], pen=pg.mkPen(width=2))
+        self.do_curve.curve.setCacheMode(QtWidgets.QGraphicsItem.CacheMode.DeviceCoordinateCache)
+        self._rebuild_ticks(self.sp_span.value())
 
         # ========= Splitter (drag to resize) =========
         self.splitter = QtWidgets.QSplitter(QtCore.Qt.Orientation.Vertical)
@@ -156,6 +219,25 @@ class CombinedChartWindow(QtWidgets.QMainWindow):
 
         outer.addWidget(self.splitter)
 
+        # Per-section sample blocks reused across frames, and the last window drawn
+        self._ai_block = np.empty((len(self.ai_curves), 0), dtype=np.float32)
+        self._ao_block = np.empty((len(self.ao_curves), 0), dtype=np.float32)
+        self._do_buf = np.empty((8, 0), dtype=np.float32)
+        self._last_frame = None
+
+        warm_up()  # compile the numba kernels now rather than on the first frame
+        self._prep_signals = _PrepSignals()
+        self._prep_signals.done.connect(self._on_prep_done)
+        self._prep_signals.failed.connect(self.renderError)
+        self._prep_busy = False
+        self._prep_job = None
+        self._prep_pending = None
+
+        self._pending_xrange = None
+        self._xrange_timer = QtCore.QTimer(self)
+        self._xrange_timer.setSingleShot(True)
+        self._xrange_timer.timeout.connect(self._flush_xrange)
+
         # Initial sync of control bars to current plot states
         self._ctrl_sync("AI")
         self._ctrl_sync("AO")
@@ -165,14 +247,21 @@ class CombinedChartWindow(QtWidgets.QMainWindow):
         self.sp_span.blockSignals(True)
         self.sp_span.setValue(float(seconds))
         self.sp_span.blockSignals(False)
+        self._rebuild_ticks(seconds)
 
-    def _make_analog_row(self, kind, idx, name, unit, start_locked=False, start_range=None):
-        """Build one analog row (AI or AO) with header + plot."""
-        row = QtWidgets.QWidget()
-        v = QtWidgets.QVBoxLayout(row)
-        v.setContentsMargins(0, 0, 0, 0)
-        v.setSpacing(4)
+    def _rebuild_ticks(self, seconds):
+        """Fix the DO time-axis tick spacing for this span (1-2-5 steps, ~6 major ticks).
 
+        The window scrolls, so tick positions still move with the data; pinning the
+        spacing just stops the axis re-deriving it on every paint.
+        """
+        raw = max(float(seconds), 1e-6) / 6.0
+        mag = 10.0 ** np.floor(np.log10(raw))
+        step = next(m * mag for m in (1.0, 2.0, 5.0, 10.0) if m * mag >= raw)
+        self._do_pi.getAxis('bottom').setTickSpacing(step, step / 5.0)
+
+    def _make_analog_row(self, glw, kind, idx, name, unit, start_locked=False, start_range=None):
+        """Build one analog row (AI or AO): header widgets + a PlotItem in the section's layout."""
         # Header (we keep it constructed but DO NOT add it to the layout to save height)
         hdr = QtWidgets.QWidget()
         hl = QtWidgets.QHBoxLayout(hdr)
@@ -209,22 +298,23 @@ class CombinedChartWindow(QtWidgets.QMainWindow):
         sp_min.editingFinished.connect(lambda k=kind, i=idx, smin=sp_min, smax=sp_max: self._apply_if_manual(k, i, smin.value(), smax.value()))
         sp_max.editingFinished.connect(lambda k=kind, i=idx, smin=sp_min, smax=sp_max: self._apply_if_manual(k, i, smin.value(), smax.value()))
 
-        # Plot
-        plt = pg.PlotWidget()
-        pi = plt.getPlotItem()
-        pi.showGrid(x=True, y=True, alpha=0.2)
-        pi.hideAxis('bottom')
+        # Plot (row idx of the section layout; X follows the first row)
+        plt = glw.addPlot(row=idx, col=0)
+        plt.showGrid(x=True, y=True, alpha=0.2)
+        plt.hideAxis('bottom')
         unit_txt = f" [{unit}]" if unit else ""
-        pi.setTitle(f"{name}{unit_txt}")
-        pi.getViewBox().setMenuEnabled(False)
+        plt.setTitle(f"{name}{unit_txt}")
+        plt.getViewBox().setMenuEnabled(False)
+        if idx > 0:
+            plt.setXLink(glw.getItem(0, 0))
 
-        curve = plt.plot([], [], pen=pg.mkPen(width=2), clickable=True)
+        curve = plt.plot([], [], pen=pg.mkPen(width=2), connect='finite', clickable=True)  # NaN = gap
+        curve.curve.setCacheMode(QtWidgets.QGraphicsItem.CacheMode.DeviceCoordinateCache)
         try:
             curve.setClipToView(True)
             curve.setDownsampling(auto=True, method='peak')
         except Exception:
             pass
-        v.addWidget(plt)
 
         # initial lock state
         sp_min.setDisabled(chk_auto.isChecked())
@@ -234,17 +324,13 @@ class CombinedChartWindow(QtWidgets.QMainWindow):
         # so do NOT call _set_fixed_scale (it indexes those lists).
         if start_locked and start_range:
             ymin = float(start_range[0]); ymax = float(start_range[1])
-            if kind == "AI":
-                self.ai_locked[idx] = True
-                self.ai_ranges[idx] = (ymin, ymax)
-            else:  # AO
-                self.ao_locked[idx] = True
-                self.ao_ranges[idx] = (ymin, ymax)
-            pi = plt.getPlotItem()
-            pi.enableAutoRange(axis='y', enable=False)
-            pi.setYRange(ymin, ymax, padding=0.0)
-
-        return row, plt, curve, (chk_auto, sp_min, sp_max, btn_apply, lbl_chan)
+            sec = self._sections[kind]
+            sec.locked[idx] = True
+            sec.ranges[idx] = (ymin, ymax)
+            plt.enableAutoRange(axis='y', enable=False)
+            plt.setYRange(ymin, ymax, padding=0.0)
+
+        return plt, curve, (chk_auto, sp_min, sp_max, btn_apply, lbl_chan)
 
     # ---------- header callbacks ----------
 
@@ -255,10 +341,7 @@ class CombinedChartWindow(QtWidgets.QMainWindow):
 
     def _on_auto_toggled(self, kind, idx, checked):
         chk, sp_min, sp_max, *_ = self._get_hdr(kind, idx)
-        if kind == "AI":
-            self.ai_locked[idx] = not checked
-        else:
-            self.ao_locked[idx] = not checked
+        self._sections[kind].locked[idx] = not checked
         sp_min.setDisabled(checked)
         sp_max.setDisabled(checked)
         if checked:
@@ -284,16 +367,14 @@ class CombinedChartWindow(QtWidgets.QMainWindow):
             nm = self._ai_names[i] if i < len(self._ai_names) else f"AI{i}"
             unit = self._ai_units[i] if (i < len(self._ai_units) and self._ai_units[i]) else ""
             unit_txt = f" [{unit}]" if unit else ""
-            plt.getPlotItem().setTitle(f"{nm}{unit_txt}")
+            title = f"{nm}{unit_txt}"
+            if title != self._ai_titles[i]:  # setTitle relayouts the plot; skip unchanged ones
+                plt.setTitle(title)
+                self._ai_titles[i] = title
         if hasattr(self, "_ai_ctrl"):
-            sel = self._ai_ctrl["sel"]
-            sel.blockSignals(True)
-            sel.clear()
-            for i in range(len(self._ai_names)):
-                nm = self._ai_names[i] if i < len(self._ai_names) else f"AI{i}"
-                sel.addItem(f"AI{i} - {nm}")
-            sel.blockSignals(False)
-            self._ctrl_sync("AI")
+            items = [f"AI{i} - {nm}" for i, nm in enumerate(self._ai_names)]
+            if self._ctrl_set_items(self._ai_ctrl, items):
+                self._ctrl_sync("AI")
 
     def set_ao_names_units(self, names, units):
         self._ao_names = list(names)
@@ -302,105 +383,167 @@ class CombinedChartWindow(QtWidgets.QMainWindow):
             nm = self._ao_names[i] if i < len(self._ao_names) else f"AO{i}"
             unit = self._ao_units[i] if (i < len(self._ao_units) and self._ao_units[i]) else ""
             unit_txt = f" [{unit}]" if unit else ""
-            plt.getPlotItem().setTitle(f"{nm}{unit_txt}")
+            title = f"{nm}{unit_txt}"
+            if title != self._ao_titles[i]:  # setTitle relayouts the plot; skip unchanged ones
+                plt.setTitle(title)
+                self._ao_titles[i] = title
         if hasattr(self, "_ao_ctrl"):
-            sel = self._ao_ctrl["sel"]
-            sel.blockSignals(True)
-            sel.clear()
-            for i in range(min(2, len(self._ao_names))):
-                nm = self._ao_names[i] if i < len(self._ao_names) else f"AO{i}"
-                sel.addItem(f"AO{i} - {nm}")
-            sel.blockSignals(False)
-            self._ctrl_sync("AO")
+            items = [f"AO{i} - {nm}" for i, nm in enumerate(self._ao_names[:2])]
+            if self._ctrl_set_items(self._ao_ctrl, items):
+                self._ctrl_sync("AO")
 
     def set_data(self, x, ai_ys, ao_ys, do_ys):
-        # ---- AI ----
         x = np.asarray(x, dtype=float)
         n = x.shape[0]
-        for i, y in enumerate(ai_ys):
-            y_arr = np.asarray(y, dtype=float)
-            if y_arr.shape[0] != n:
-                if y_arr.shape[0] > n:
-                    y_arr = y_arr[-n:]
-                else:
-                    y_arr = np.concatenate([np.full(n - y_arr.shape[0], np.nan, dtype=float), y_arr])
-            self.ai_curves[i].setData(x, y_arr)
-
-            # enforce fixed y-range if locked
-            if self.ai_locked[i] and self.ai_ranges[i][0] is not None:
-                pi = self.ai_plots[i].getPlotItem()
-                pi.enableAutoRange(axis='y', enable=False)
-                ymin, ymax = self.ai_ranges[i]
-                pi.setYRange(float(ymin), float(ymax), padding=0.0)
-
-        # ---- AO (two rows) ----
-        ao_n = min(2, len(ao_ys))
-        for i in range(ao_n):
-            y = np.asarray(ao_ys[i], dtype=float)
-            if y.shape[0] != n:
-                if y.shape[0] > n:
-                    y = y[-n:]
-                else:
-                    y = np.concatenate([np.full(n - y.shape[0], np.nan, dtype=float), y])
-            self.ao_curves[i].setData(x, y)
-
-            # enforce fixed y-range if locked
-            if self.ao_locked[i] and self.ao_ranges[i][0] is not None:
-                pi = self.ao_plots[i].getPlotItem()
-                pi.enableAutoRange(axis='y', enable=False)
-                ymin, ymax = self.ao_ranges[i]
-                pi.setYRange(float(ymin), float(ymax), padding=0.0)
-
-        # ---- DO (fixed-scale, stepMode) ----
+
+        # Same window as last frame (no new samples): nothing to redraw
+        frame = (n, float(x[0]), float(x[-1])) if n else (0, 0.0, 0.0)
+        if frame == self._last_frame:
+            return
+        self._last_frame = frame
+
+        # enforce fixed y-range on locked rows; only touch the axis if the view has drifted
+        for sec in self._sections.values():
+            n_rows = len(sec.plots)
+            for i in np.flatnonzero(sec.locked[:n_rows] & np.isfinite(sec.ranges[:n_rows, 0])):
+                pi = sec.plots[i]
+                ymin, ymax = float(sec.ranges[i, 0]), float(sec.ranges[i, 1])
+                if pi.getAxis('left').range != [ymin, ymax]:
+                    pi.enableAutoRange(axis='y', enable=False)
+                    pi.setYRange(ymin, ymax, padding=0.0)
+
+        # The numeric prep (block fill, M4, DO step paths) runs on the thread pool;
+        # only one job is in flight and only the newest waiting frame is kept.
+        snap = (x, ai_ys, ao_ys[:2], do_ys,
+                [int(p.width()) for p in self.ai_plots], [int(p.width()) for p in self.ao_plots])
+        if self._prep_busy:
+            self._prep_pending = snap
+            return
+        self._prep_start(snap)
+
+    def _prep_start(self, snap):
+        self._prep_busy = True
+        self._prep_job = _Prep(self._prep_frame, snap, self._prep_signals)
+        QtCore.QThreadPool.globalInstance().start(self._prep_job)
+
+    def _on_prep_done(self, out):
+        self._prep_busy = False
+        self._prep_job = None
+        if out is not None:
+            self.setUpdatesEnabled(False)  # all curves land in one repaint
+            try:
+                for curves, rows in ((self.ai_curves, out["ai"]), (self.ao_curves, out["ao"])):
+                    for curve, (xx, yy, reduced) in zip(curves, rows):
+                        if reduced:
+                            # M4 only reduces all-finite rows, so pyqtgraph's isfinite scan can be skipped
+                            curve.setData(xx, yy, connect='all', skipFiniteCheck=True)
+                        else:
+                            curve.setData(xx, yy, connect='finite')  # NaN padding breaks the line
+                if out["do"] is not None:
+                    xs, ys, conn = out["do"]
+                    self.do_curve.setData(x=xs, y=ys, connect=conn, skipFiniteCheck=True)  # 0/1 lanes are always finite
+            finally:
+                self.setUpdatesEnabled(True)
+
+            # Follow-tail range is applied once per event-loop pass, not once per frame
+            if out["xrange"] is not None:
+                self._pending_xrange = out["xrange"]
+                if not self._xrange_timer.isActive():
+                    self._xrange_timer.start(0)
+
+        if self._prep_pending is not None:
+            snap, self._prep_pending = self._prep_pending, None
+            self._prep_start(snap)
+
+    def _prep_frame(self, snap):
+        """Build display-ready arrays for one frame. Runs on a pool thread: numpy only, no Qt."""
+        x, ai_ys, ao_ys, do_ys, ai_w, ao_w = snap
+        n = x.shape[0]
+        out = {"ai": [], "ao": [], "do": None, "xrange": None}
+
+        # ---- AI + AO rows ----
+        # Each section's samples land in one (channels, n) float32 block, NaN-padded on the left
+        for blk_name, key, ys, widths in (("_ai_block", "ai", ai_ys, ai_w),
+                                          ("_ao_block", "ao", ao_ys, ao_w)):
+            blk = self._section_block(blk_name, len(widths), n)
+            for i, (y, w) in enumerate(zip(ys, widths)):
+                row = blk[i]
+                y_arr = np.asarray(y, dtype=np.float32)
+                k = min(n, y_arr.shape[0])
+                row[:n - k] = np.nan
+                row[n - k:] = y_arr[y_arr.shape[0] - k:]
+                xx, yy = m4_downsample(x, row, w)
+                reduced = xx is not x
+                # arrays handed to the GUI thread must not alias the reusable block
+                out[key].append((xx, yy if reduced else yy.copy(), reduced))
+
+        # ---- DO (fixed-scale, step traces built from transitions only) ----
         N = x.size
         if N == 0:
-            return
+            return out
         dx = (x[-1] - x[-2]) if N > 1 else 1e-3
         if not np.isfinite(dx) or dx <= 0:
             dx = (x[-1] - x[0]) / max(1, N - 1) if N > 1 else 1e-3
             if dx <= 0:
                 dx = 1e-3
-        x_edges = np.empty(N + 1, dtype=float)
-        x_edges[:-1] = x
-        x_edges[-1] = x[-1] + dx
-        dpi = self.do_plot.getPlotItem()
-        dpi.setXRange(x_edges[0], x_edges[-1], padding=0.0)
+        x_lo, x_hi = float(x[0]), float(x[-1] + dx)
+        out["xrange"] = (x_lo, x_hi)
 
+        # Stack all lanes into one reusable (8, N) float32 block, then map bits to levels in place
+        if self._do_buf.shape[1] < N:
+            self._do_buf = np.empty((8, max(N, 2 * self._do_buf.shape[1])), dtype=np.float32)
+        blk = self._do_buf[:, :N]
         for i in range(8):
-            y = np.asarray(do_ys[i], dtype=float)
-            if y.size != N:
-                nn = min(N, y.size)
-                y = y[-nn:]
-                xe = x_edges[-(nn + 1):]
-            else:
-                xe = x_edges
-            self.do_curves[i].setData(x=xe, y=y * self.do_amp + self.do_offsets[i])
+            y = np.asarray(do_ys[i], dtype=np.uint8)  # DO history is 0/1
+            k = min(N, y.shape[0])
+            blk[i, :N - k] = 0
+            blk[i, N - k:] = y[y.shape[0] - k:]
+        pack_do_lanes(blk, self.do_offsets, self.do_amp, blk)
+
+        # A lane only carries information at its edges: draw start, a vertical
+        # step at each transition, and the end of the window (2*T + 2 points)
+        paths = [do_step_path(blk[i], x, x_lo, x_hi) for i in range(8)]
+        xs = np.concatenate([p[0] for p in paths])
+        ys = np.concatenate([p[1] for p in paths])
+        conn = np.ones(xs.shape[0], dtype=bool)
+        conn[np.cumsum([p[0].shape[0] for p in paths]) - 1] = False  # no segment from a lane's end to the next lane
+        out["do"] = (xs, ys, conn)
+        return out
 
     # ---------- helpers ----------
 
+    def _flush_xrange(self):
+        rng = self._pending_xrange
+        if rng is None:
+            return
+        self._pending_xrange = None
+        self._do_pi.setXRange(rng[0], rng[1], padding=0.0)
+
+    def _section_block(self, name, rows, n):
+        """Return a (rows, n) float32 view of the named reusable block, growing it if needed."""
+        blk = getattr(self, name)
+        if blk.shape[0] < rows or blk.shape[1] < n:
+            blk = np.empty((max(rows, blk.shape[0]), max(n, 2 * blk.shape[1])), dtype=np.float32)
+            setattr(self, name, blk)
+        return blk[:rows, :n]
+
     def _get_hdr(self, kind, idx):
-        return (self.ai_headers[idx] if kind == "AI" else self.ao_headers[idx])
+        return self._sections[kind].headers[idx]
 
     def _get_view(self, kind, idx):
-        pi = (self.ai_plots[idx].getPlotItem() if kind == "AI" else self.ao_plots[idx].getPlotItem())
-        return tuple(pi.getViewBox().viewRange()[1])
+        pi = self._sections[kind].plots[idx]
+        return tuple(pi.getAxis('left').range)  # kept in step with the view by pyqtgraph
 
     def _autoscale(self, kind, idx):
-        pi = (self.ai_plots[idx].getPlotItem() if kind == "AI" else self.ao_plots[idx].getPlotItem())
-        if kind == "AI":
-            self.ai_locked[idx] = False
-        else:
-            self.ao_locked[idx] = False
-        pi.enableAutoRange(axis='y', enable=True)
+        sec = self._sections[kind]
+        sec.locked[idx] = False
+        sec.plots[idx].enableAutoRange(axis='y', enable=True)
 
     def _set_fixed_scale(self, kind, idx, ymin, ymax):
-        pi = (self.ai_plots[idx].getPlotItem() if kind == "AI" else self.ao_plots[idx].getPlotItem())
-        if kind == "AI":
-            self.ai_locked[idx] = True
-            self.ai_ranges[idx] = (float(ymin), float(ymax))
-        else:
-            self.ao_locked[idx] = True
-            self.ao_ranges[idx] = (float(ymin), float(ymax))
+        sec = self._sections[kind]
+        sec.locked[idx] = True
+        sec.ranges[idx] = (float(ymin), float(ymax))
+        pi = sec.plots[idx]
         pi.enableAutoRange(axis='y', enable=False)
         pi.setYRange(float(ymin), float(ymax), padding=0.0)
 
@@ -435,66 +578,65 @@ class CombinedChartWindow(QtWidgets.QMainWindow):
         h.addWidget(QtWidgets.QLabel("Y max:")); h.addWidget(sp_max)
         h.addWidget(btn); h.addStretch(1)
 
-        # wire
+        # wire (one partial per slot; each signal's argument lands in the slot's trailing parameter)
+        sel.currentIndexChanged.connect(partial(self._ctrl_sync, section))
+        chk.toggled.connect(partial(self._ctrl_auto_toggled, section))
+        apply = partial(self._ctrl_apply, section)
+        btn.clicked.connect(apply)
+        sp_min.editingFinished.connect(apply)
+        sp_max.editingFinished.connect(apply)
+        ctrl = {"w": w, "sel": sel, "chk": chk, "mn": sp_min, "mx": sp_max, "btn": btn, "items": items}
         if section == "AI":
-            sel.currentIndexChanged.connect(lambda _=0: self._ctrl_sync("AI"))
-            chk.toggled.connect(lambda checked: self._ctrl_auto_toggled("AI", checked))
-            btn.clicked.connect(lambda: self._ctrl_apply("AI"))
-            sp_min.editingFinished.connect(lambda: self._ctrl_apply("AI"))
-            sp_max.editingFinished.connect(lambda: self._ctrl_apply("AI"))
-            self._ai_ctrl = {"w": w, "sel": sel, "chk": chk, "mn": sp_min, "mx": sp_max, "btn": btn}
+            self._ai_ctrl = ctrl
         else:
-            sel.currentIndexChanged.connect(lambda _=0: self._ctrl_sync("AO"))
-            chk.toggled.connect(lambda checked: self._ctrl_auto_toggled("AO", checked))
-            btn.clicked.connect(lambda: self._ctrl_apply("AO"))
-            sp_min.editingFinished.connect(lambda: self._ctrl_apply("AO"))
-            sp_max.editingFinished.connect(lambda: self._ctrl_apply("AO"))
-            self._ao_ctrl = {"w": w, "sel": sel, "chk": chk, "mn": sp_min, "mx": sp_max, "btn": btn}
+            self._ao_ctrl = ctrl
 
         return w
 
-    def _ctrl_sync(self, section: str):
+    def _ctrl_set_items(self, ctrl, items):
+        """Bring the selector's entries in line with items; returns True if anything changed."""
+        if items == ctrl["items"]:
+            return False
+        sel = ctrl["sel"]
+        sel.blockSignals(True)
+        if len(items) == len(ctrl["items"]):
+            for i, (old, new) in enumerate(zip(ctrl["items"], items)):
+                if old != new:
+                    sel.setItemText(i, new)
+        else:
+            sel.clear()
+            sel.addItems(items)
+        sel.blockSignals(False)
+        ctrl["items"] = items
+        return True
+
+    def _ctrl_sync(self, section: str, _idx=None):
         """Load control bar from current plot state for the selected channel."""
-        if section == "AI":
-            idx = self._ai_ctrl["sel"].currentIndex()
-            locked = self.ai_locked[idx]
-            self._ai_ctrl["chk"].blockSignals(True)
-            self._ai_ctrl["chk"].setChecked(not locked)
-            self._ai_ctrl["chk"].blockSignals(False)
-            if locked and self.ai_ranges[idx][0] is not None:
-                mn, mx = self.ai_ranges[idx]
-            else:
-                mn, mx = self._get_view("AI", idx)
-            self._ai_ctrl["mn"].blockSignals(True); self._ai_ctrl["mx"].blockSignals(True)
-            if mn is not None and mx is not None:
-                self._ai_ctrl["mn"].setValue(float(mn)); self._ai_ctrl["mx"].setValue(float(mx))
-            self._ai_ctrl["mn"].blockSignals(False); self._ai_ctrl["mx"].blockSignals(False)
+        sec = self._sections[section]
+        ctrl = getattr(self, sec.ctrl_attr)
+        idx = ctrl["sel"].currentIndex()
+        locked = sec.locked[idx]
+        ctrl["chk"].blockSignals(True)
+        ctrl["chk"].setChecked(not locked)
+        ctrl["chk"].blockSignals(False)
+        if locked and np.isfinite(sec.ranges[idx, 0]):
+            mn, mx = sec.ranges[idx]
         else:
-            idx = self._ao_ctrl["sel"].currentIndex()
-            locked = self.ao_locked[idx]
-            self._ao_ctrl["chk"].blockSignals(True)
-            self._ao_ctrl["chk"].setChecked(not locked)  # <- fixed (no '!locked', no duplicate)
-            self._ao_ctrl["chk"].blockSignals(False)
-            if locked and self.ao_ranges[idx][0] is not None:
-                mn, mx = self.ao_ranges[idx]
-            else:
-                mn, mx = self._get_view("AO", idx)
-            self._ao_ctrl["mn"].blockSignals(True); self._ao_ctrl["mx"].blockSignals(True)
-            if mn is not None and mx is not None:
-                self._ao_ctrl["mn"].setValue(float(mn)); self._ao_ctrl["mx"].setValue(float(mx))
-            self._ao_ctrl["mn"].blockSignals(False); self._ao_ctrl["mx"].blockSignals(False)
+            mn, mx = self._get_view(section, idx)
+        ctrl["mn"].blockSignals(True); ctrl["mx"].blockSignals(True)
+        if mn is not None and mx is not None:
+            ctrl["mn"].setValue(float(mn)); ctrl["mx"].setValue(float(mx))
+        ctrl["mn"].blockSignals(False); ctrl["mx"].blockSignals(False)
 
     def _ctrl_auto_toggled(self, section: str, checked: bool):
-        idx = (self._ai_ctrl["sel"].currentIndex() if section == "AI" else self._ao_ctrl["sel"].currentIndex())
+        ctrl = getattr(self, self._sections[section].ctrl_attr)
+        idx = ctrl["sel"].currentIndex()
         if checked:
             self._autoscale(section, idx)
         else:
-            mn = (self._ai_ctrl["mn"].value() if section == "AI" else self._ao_ctrl["mn"].value())
-            mx = (self._ai_ctrl["mx"].value() if section == "AI" else self._ao_ctrl["mx"].value())
-            self._set_fixed_scale(section, idx, float(mn), float(mx))
-
-    def _ctrl_apply(self, section: str):
-        idx = (self._ai_ctrl["sel"].currentIndex() if section == "AI" else self._ao_ctrl["sel"].currentIndex())
-        mn = (self._ai_ctrl["mn"].value() if section == "AI" else self._ao_ctrl["mn"].value())
-        mx = (self._ai_ctrl["mx"].value() if section == "AI" else self._ao_ctrl["mx"].value())
-        self._set_fixed_scale(section, idx, float(mn), float(mx))
+            self._set_fixed_scale(section, idx, float(ctrl["mn"].value()), float(ctrl["mx"].value()))
+
+    def _ctrl_apply(self, section: str, _checked=False):
+        ctrl = getattr(self, self._sections[section].ctrl_attr)
+        idx = ctrl["sel"].currentIndex()
+        self._set_fixed_scale(section, idx, float(ctrl["mn"].value()), float(ctrl["mx"].value()))
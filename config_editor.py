@@ -1,83 +1,175 @@
+import copy
+
 from PyQt6 import QtCore, QtWidgets
-from config_manager import AppConfig, AnalogCfg, DigitalOutCfg, AnalogOutCfg
+from config_manager import AppConfig
+
+# Qt enum values used per cell, resolved once
+_DISPLAY = QtCore.Qt.ItemDataRole.DisplayRole
+_EDIT = QtCore.Qt.ItemDataRole.EditRole
+_CHECK_ROLE = QtCore.Qt.ItemDataRole.CheckStateRole
+_ALIGN_ROLE = QtCore.Qt.ItemDataRole.TextAlignmentRole
+_CHECKED = QtCore.Qt.CheckState.Checked
+_UNCHECKED = QtCore.Qt.CheckState.Unchecked
+_ALIGN_R = QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter
+_FLAGS_BASE = QtCore.Qt.ItemFlag.ItemIsEnabled | QtCore.Qt.ItemFlag.ItemIsSelectable
+_FLAGS_CHECK = _FLAGS_BASE | QtCore.Qt.ItemFlag.ItemIsUserCheckable
+_FLAGS_EDIT = _FLAGS_BASE | QtCore.Qt.ItemFlag.ItemIsEditable
+
+def _cell_text(val):
+    return "" if val is None else str(val)
+
+_AI_MODES = ("SE", "DIFF")  # cfg.aiMode value per mode-combo index
+_AI_MODE_LABELS = ("SE (8 channels)", "DIFF (4 channels)")
+
+class _CfgTableModel(QtCore.QAbstractTableModel):
+    """Editable table over a list of config dataclasses; one row per entry, one column per field.
+
+    fields: (attribute, kind) per column, kind in {"str", "float", "bool"}. The model
+    edits its own copies, so Cancel leaves the caller's config untouched. Cell text is
+    formatted once per load/edit and served from _text on every repaint.
+    """
+    def __init__(self, headers, fields, parent=None):
+        super().__init__(parent)
+        self._headers = headers
+        self._fields = fields
+        self._rows = []
+        self._text = []  # per row, display string per column
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self._rows = [copy.copy(r) for r in rows]
+        self._text = [[_cell_text(getattr(r, attr)) for attr, _ in self._fields] for r in self._rows]
+        self.endResetModel()
+
+    def rows(self):
+        return [copy.copy(r) for r in self._rows]
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._fields)
+
+    def headerData(self, section, orientation, role=_DISPLAY):
+        if orientation == QtCore.Qt.Orientation.Horizontal and role == _DISPLAY:
+            return self._headers[section]
+        return None
+
+    def flags(self, index):
+        return _FLAGS_CHECK if self._fields[index.column()][1] == "bool" else _FLAGS_EDIT
+
+    def data(self, index, role=_DISPLAY):
+        attr, kind = self._fields[index.column()]
+        if kind == "bool":
+            if role == _CHECK_ROLE:
+                val = getattr(self._rows[index.row()], attr)
+                return _CHECKED if val else _UNCHECKED
+            return None
+        if role in (_DISPLAY, _EDIT):
+            return self._text[index.row()][index.column()]  # text for EditRole too, so the editor is a plain line edit
+        if role == _ALIGN_ROLE and kind == "float":
+            return _ALIGN_R
+        return None
+
+    def setData(self, index, value, role=_EDIT):
+        attr, kind = self._fields[index.column()]
+        row = self._rows[index.row()]
+        if kind == "bool":
+            if role != _CHECK_ROLE:
+                return False
+            setattr(row, attr, QtCore.Qt.CheckState(value) == _CHECKED)
+        elif role == _EDIT:
+            if kind == "float":
+                try:
+                    value = float(value)
+                except (TypeError, ValueError):
+                    return False  # keep the old value rather than storing text in a float field
+            setattr(row, attr, value)
+            self._text[index.row()][index.column()] = _cell_text(value)
+        else:
+            return False
+        self.dataChanged.emit(index, index, [role])
+        return True
 
 class ConfigEditorDialog(QtWidgets.QDialog):
     def __init__(self, parent, cfg: AppConfig):
         super().__init__(parent)
         self.setWindowTitle("Edit Config")
-        self._cfg = cfg
         self.resize(900, 600)
         layout = QtWidgets.QVBoxLayout(self)
 
-        tabs = QtWidgets.QTabWidget(); layout.addWidget(tabs)
+        self.tabs = tabs = QtWidgets.QTabWidget(); layout.addWidget(tabs)
 
         gen = QtWidgets.QWidget(); gform = QtWidgets.QFormLayout(gen)
-        self.sp_board = QtWidgets.QSpinBox(); self.sp_board.setRange(0, 31); self.sp_board.setValue(cfg.boardNum)
-        self.sp_rate = QtWidgets.QDoubleSpinBox(); self.sp_rate.setRange(0.1, 200000.0); self.sp_rate.setDecimals(3); self.sp_rate.setValue(cfg.sampleRateHz)
-        self.sp_block = QtWidgets.QSpinBox(); self.sp_block.setRange(1, 65536); self.sp_block.setValue(cfg.blockSize)
-        self.cmb_mode = QtWidgets.QComboBox(); self.cmb_mode.addItems(["SE (8 channels)", "DIFF (4 channels)"]); self.cmb_mode.setCurrentIndex(0 if cfg.aiMode.upper().startswith("SE") else 1)
+        self.sp_board = QtWidgets.QSpinBox(); self.sp_board.setRange(0, 31)
+        self.sp_rate = QtWidgets.QDoubleSpinBox(); self.sp_rate.setRange(0.1, 200000.0); self.sp_rate.setDecimals(3)
+        self.sp_block = QtWidgets.QSpinBox(); self.sp_block.setRange(1, 65536)
+        self.cmb_mode = QtWidgets.QComboBox(); self.cmb_mode.addItems(_AI_MODE_LABELS)
         gform.addRow("Board #", self.sp_board); gform.addRow("Sample Rate (Hz)", self.sp_rate); gform.addRow("Block Size", self.sp_block); gform.addRow("Analog Input Mode", self.cmb_mode)
         tabs.addTab(gen, "General")
 
-        aiw = QtWidgets.QWidget(); vbox = QtWidgets.QVBoxLayout(aiw)
-        self.tbl_ai = QtWidgets.QTableWidget(8, 5); self.tbl_ai.setHorizontalHeaderLabels(["Name","Slope","Offset","Cutoff Hz","Units"])
-        self.tbl_ai.horizontalHeader().setStretchLastSection(True)
-        for i, a in enumerate(cfg.analogs):
-            self.tbl_ai.setItem(i, 0, QtWidgets.QTableWidgetItem(a.name))
-            for col, val in enumerate([a.slope, a.offset, a.cutoffHz], start=1):
-                item = QtWidgets.QTableWidgetItem(str(val)); item.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter)
-                self.tbl_ai.setItem(i, col, item)
-            self.tbl_ai.setItem(i, 4, QtWidgets.QTableWidgetItem(a.units or ""))
-        vbox.addWidget(self.tbl_ai); tabs.addTab(aiw, "Analog Inputs")
-
-        dow = QtWidgets.QWidget(); vbox2 = QtWidgets.QVBoxLayout(dow)
-        self.tbl_do = QtWidgets.QTableWidget(8, 4); self.tbl_do.setHorizontalHeaderLabels(["Name","Normally Open","Momentary","Actuation Time (s)"])
-        self.tbl_do.horizontalHeader().setStretchLastSection(True)
-        for i, d in enumerate(cfg.digitalOutputs):
-            self.tbl_do.setItem(i, 0, QtWidgets.QTableWidgetItem(d.name))
-            chk_no = QtWidgets.QTableWidgetItem(); chk_no.setFlags(chk_no.flags() | QtCore.Qt.ItemFlag.ItemIsUserCheckable); chk_no.setCheckState(QtCore.Qt.CheckState.Checked if d.normallyOpen else QtCore.Qt.CheckState.Unchecked)
-            chk_mo = QtWidgets.QTableWidgetItem(); chk_mo.setFlags(chk_mo.flags() | QtCore.Qt.ItemFlag.ItemIsUserCheckable); chk_mo.setCheckState(QtCore.Qt.CheckState.Checked if d.momentary else QtCore.Qt.CheckState.Unchecked)
-            self.tbl_do.setItem(i, 1, chk_no); self.tbl_do.setItem(i, 2, chk_mo)
-            item_time = QtWidgets.QTableWidgetItem(str(d.actuationTime)); item_time.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter)
-            self.tbl_do.setItem(i, 3, item_time)
-        vbox2.addWidget(self.tbl_do); tabs.addTab(dow, "Digital Outputs")
-
-        aow = QtWidgets.QWidget(); vbox3 = QtWidgets.QVBoxLayout(aow)
-        self.tbl_ao = QtWidgets.QTableWidget(2, 4); self.tbl_ao.setHorizontalHeaderLabels(["Name","Min V","Max V","Startup V"])
-        self.tbl_ao.horizontalHeader().setStretchLastSection(True)
-        for i, a in enumerate(cfg.analogOutputs):
-            self.tbl_ao.setItem(i, 0, QtWidgets.QTableWidgetItem(a.name))
-            for col, val in enumerate([a.minV, a.maxV, a.startupV], start=1):
-                item = QtWidgets.QTableWidgetItem(str(val)); item.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter)
-                self.tbl_ao.setItem(i, col, item)
-        vbox3.addWidget(self.tbl_ao); tabs.addTab(aow, "Analog Outputs")
+        # Each table is a view over a model holding copies of the config dataclasses
+        self.ai_model = _CfgTableModel(["Name","Slope","Offset","Cutoff Hz","Units"],
+                                       [("name", "str"), ("slope", "float"), ("offset", "float"), ("cutoffHz", "float"), ("units", "str")], self)
+        self.do_model = _CfgTableModel(["Name","Normally Open","Momentary","Actuation Time (s)"],
+                                       [("name", "str"), ("normallyOpen", "bool"), ("momentary", "bool"), ("actuationTime", "float")], self)
+        self.ao_model = _CfgTableModel(["Name","Min V","Max V","Startup V"],
+                                       [("name", "str"), ("minV", "float"), ("maxV", "float"), ("startupV", "float")], self)
+        # Tables edited since the last load(); untouched ones hand back the loaded entries as-is
+        self._dirty = set()
+        for key, model in (("ai", self.ai_model), ("do", self.do_model), ("ao", self.ao_model)):
+            model.dataChanged.connect(lambda *_, k=key: self._dirty.add(k))
+
+        # The table views are built the first time their tab is shown; models are always live
+        self.tbl_ai = self.tbl_do = self.tbl_ao = None
+        self._builders = {}
+        with QtCore.QSignalBlocker(tabs):  # no currentChanged while the placeholders go in
+            for attr, model, title, widths in (("tbl_ai", self.ai_model, "Analog Inputs", (180, 90, 90, 90, 80)),
+                                               ("tbl_do", self.do_model, "Digital Outputs", (180, 110, 90, 130)),
+                                               ("tbl_ao", self.ao_model, "Analog Outputs", (180, 90, 90, 90))):
+                idx = tabs.addTab(QtWidgets.QWidget(), title)
+                self._builders[idx] = (attr, model, widths)
+        tabs.currentChanged.connect(self._lazy_build)
 
         btns = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.StandardButton.Ok | QtWidgets.QDialogButtonBox.StandardButton.Cancel)
         btns.accepted.connect(self.accept); btns.rejected.connect(self.reject); layout.addWidget(btns)
 
+        self.load(cfg)
+
+    def _lazy_build(self, idx):
+        """Put the table view into tab idx's placeholder page on first visit."""
+        entry = self._builders.pop(idx, None)
+        if entry is None:
+            return
+        attr, model, widths = entry
+        vbox = QtWidgets.QVBoxLayout(self.tabs.widget(idx))
+        tbl = QtWidgets.QTableView(); tbl.setModel(model)
+        tbl.horizontalHeader().setStretchLastSection(True)
+        for col, w in enumerate(widths):  # fixed starting widths; nothing measures cell text
+            tbl.setColumnWidth(col, w)
+        vbox.addWidget(tbl)
+        setattr(self, attr, tbl)
+
+    def load(self, cfg: AppConfig):
+        """Show cfg in the existing widgets (the dialog is kept and reused between opens)."""
+        self._cfg = cfg
+        self.sp_board.setValue(cfg.boardNum)
+        self.sp_rate.setValue(cfg.sampleRateHz)
+        self.sp_block.setValue(cfg.blockSize)
+        self.cmb_mode.setCurrentIndex(0 if cfg.aiMode.upper().startswith("SE") else 1)
+        self._dirty.clear()
+        self.ai_model.set_rows(cfg.analogs)
+        self.do_model.set_rows(cfg.digitalOutputs)
+        self.ao_model.set_rows(cfg.analogOutputs)
+
     def updated_config(self) -> AppConfig:
         cfg = AppConfig()
         cfg.boardNum = int(self.sp_board.value())
         cfg.sampleRateHz = float(self.sp_rate.value())
         cfg.blockSize = int(self.sp_block.value())
-        cfg.aiMode = "SE" if self.cmb_mode.currentIndex() == 0 else "DIFF"
-        for i in range(8):
-            name = self.tbl_ai.item(i, 0).text() if self.tbl_ai.item(i, 0) else f"AI{i}"
-            slope = float(self.tbl_ai.item(i, 1).text()) if self.tbl_ai.item(i, 1) else 1.0
-            offset = float(self.tbl_ai.item(i, 2).text()) if self.tbl_ai.item(i, 2) else 0.0
-            cutoff = float(self.tbl_ai.item(i, 3).text()) if self.tbl_ai.item(i, 3) else 0.0
-            units = self.tbl_ai.item(i, 4).text() if self.tbl_ai.item(i, 4) else ""
-            cfg.analogs[i] = AnalogCfg(name=name, slope=slope, offset=offset, cutoffHz=cutoff, units=units)
-        for i in range(8):
-            name = self.tbl_do.item(i, 0).text() if self.tbl_do.item(i, 0) else f"DO{i}"
-            no = self.tbl_do.item(i, 1).checkState() == QtCore.Qt.CheckState.Checked
-            mo = self.tbl_do.item(i, 2).checkState() == QtCore.Qt.CheckState.Checked
-            t = float(self.tbl_do.item(i, 3).text()) if self.tbl_do.item(i, 3) else 0.0
-            cfg.digitalOutputs[i] = DigitalOutCfg(name=name, normallyOpen=no, momentary=mo, actuationTime=t)
-        for i in range(2):
-            name = self.tbl_ao.item(i, 0).text() if self.tbl_ao.item(i, 0) else f"AO{i}"
-            minv = float(self.tbl_ao.item(i, 1).text()) if self.tbl_ao.item(i, 1) else -10.0
-            maxv = float(self.tbl_ao.item(i, 2).text()) if self.tbl_ao.item(i, 2) else 10.0
-            st = float(self.tbl_ao.item(i, 3).text()) if self.tbl_ao.item(i, 3) else 0.0
-            cfg.analogOutputs[i] = AnalogOutCfg(name=name, minV=minv, maxV=maxv, startupV=st)
+        cfg.aiMode = _AI_MODES[self.cmb_mode.currentIndex()]
+        src, dirty = self._cfg, self._dirty
+        cfg.analogs = self.ai_model.rows() if "ai" in dirty else list(src.analogs)
+        cfg.digitalOutputs = self.do_model.rows() if "do" in dirty else list(src.digitalOutputs)
+        cfg.analogOutputs = self.ao_model.rows() if "ao" in dirty else list(src.analogOutputs)
         return cfg
@@ -1,8 +1,34 @@
 import json
-from dataclasses import dataclass, field
+import os
+from dataclasses import asdict, dataclass, field
 from typing import List
 
-@dataclass
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+
+def load_json(path: str):
+    """Parse a JSON file (orjson when installed, else the json module)."""
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_json(path: str, obj):
+    """Write obj as 2-space-indented JSON (orjson when installed, else the json module)."""
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2)
+
+
+@dataclass(slots=True, eq=False, repr=False)
 class AnalogCfg:
     name: str = "AI"
     slope: float = 1.0
@@ -10,117 +36,97 @@ class AnalogCfg:
     cutoffHz: float = 0.0
     units: str = ""
 
-@dataclass
+@dataclass(slots=True, eq=False, repr=False)
 class DigitalOutCfg:
     name: str = "DO"
     normallyOpen: bool = True
     momentary: bool = False
     actuationTime: float = 0.0
 
-@dataclass
+@dataclass(slots=True, eq=False, repr=False)
 class AnalogOutCfg:
     name: str = "AO"
     minV: float = -10.0
     maxV: float = 10.0
     startupV: float = 0.0
 
-@dataclass
+@dataclass(slots=True)
 class AppConfig:
     boardNum: int = 0
     sampleRateHz: float = 100.0
     blockSize: int = 64
+    aiMode: str = "SE"  # declared before the channel lists: field order is the saved key order
     analogs: List[AnalogCfg] = field(default_factory=lambda: [AnalogCfg() for _ in range(8)])
     digitalOutputs: List[DigitalOutCfg] = field(default_factory=lambda: [DigitalOutCfg() for _ in range(8)])
     analogOutputs: List[AnalogOutCfg] = field(default_factory=lambda: [AnalogOutCfg() for _ in range(2)])
-    aiMode: str = "SE"
+
+# Flat (legacy) config keys per channel, built once instead of formatted on every load
+_AI_KEYS = [(f"ai{i}Name", f"ai{i}Slope", f"ai{i}Offset", f"ai{i}FilterCutoffHz", f"ai{i}Units") for i in range(8)]
+_DO_KEYS = [(f"do{i}Name", f"do{i}normallyOpen", f"do{i}momentary", f"do{i}actuationTime") for i in range(8)]
+_AO_KEYS = [(f"ao{i}Name", f"ao{i}Min", f"ao{i}Max", f"ao{i}Default") for i in range(2)]
+
+# Field order per channel entry (the dataclass declaration order, which is also the saved order)
+_AI_FIELDS = ("name", "slope", "offset", "cutoffHz", "units")
+_DO_FIELDS = ("name", "normallyOpen", "momentary", "actuationTime")
+_AO_FIELDS = ("name", "minV", "maxV", "startupV")
+
+# (coerce, default) for every field after name, in _*_FIELDS order; shared by both file layouts
+def _same(v):
+    return v
+
+_AI_SPEC = ((float, 1.0), (float, 0.0), (float, 0.0), (_same, ""))
+_DO_SPEC = ((bool, True), (bool, False), (float, 0.0))
+_AO_SPEC = ((float, -10.0), (float, 10.0), (float, 0.0))
+
+def _decode(cls, get, keys, spec, default_name):
+    """Build one channel entry; get is the source's .get, keys[0] its name key, keys[1:] the rest."""
+    return cls(get(keys[0], default_name), *[conv(get(k, dflt)) for k, (conv, dflt) in zip(keys[1:], spec)])
 
 class ConfigManager:
+    # path -> ((st_mtime_ns, st_size), parsed JSON); lets a reload of an unchanged file skip the parse
+    _raw_cache: dict = {}
+
+    @staticmethod
+    def _load_raw(path: str) -> dict:
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        hit = ConfigManager._raw_cache.get(path)
+        if hit is not None and hit[0] == stamp:
+            return hit[1]
+        raw = load_json(path)
+        ConfigManager._raw_cache[path] = (stamp, raw)
+        return raw
+
     @staticmethod
     def load(path: str) -> 'AppConfig':
-        with open(path, "r", encoding="utf-8") as f:
-            raw = json.load(f)
+        raw = ConfigManager._load_raw(path)  # only read below, so safe to share between loads
         cfg = AppConfig()
         cfg.boardNum = raw.get("boardNum", raw.get("board", cfg.boardNum))
         cfg.sampleRateHz = raw.get("sampleRateHz", raw.get("sampleRate", cfg.sampleRateHz))
         cfg.blockSize = raw.get("blockSize", cfg.blockSize)
         cfg.aiMode = (raw.get("aiMode") or "SE").upper()
-        if "analogs" in raw and isinstance(raw["analogs"], list):
-            for i in range(min(8, len(raw["analogs"]))):
-                a = raw["analogs"][i] or {}
-                cfg.analogs[i] = AnalogCfg(
-                    name=a.get("name", f"AI{i}"),
-                    slope=float(a.get("slope", 1.0)),
-                    offset=float(a.get("offset", 0.0)),
-                    cutoffHz=float(a.get("cutoffHz", 0.0)),
-                    units=a.get("units", ""),
-                )
-        else:
-            for i in range(8):
-                cfg.analogs[i] = AnalogCfg(
-                    name=raw.get(f"ai{i}Name", f"AI{i}"),
-                    slope=float(raw.get(f"ai{i}Slope", 1.0)),
-                    offset=float(raw.get(f"ai{i}Offset", 0.0)),
-                    cutoffHz=float(raw.get(f"ai{i}FilterCutoffHz", 0.0)),
-                    units=raw.get(f"ai{i}Units", ""),
-                )
-        if "digitalOutputs" in raw and isinstance(raw["digitalOutputs"], list):
-            for i in range(min(8, len(raw["digitalOutputs"]))):
-                d = raw["digitalOutputs"][i] or {}
-                cfg.digitalOutputs[i] = DigitalOutCfg(
-                    name=d.get("name", f"DO{i}"),
-                    normallyOpen=bool(d.get("normallyOpen", True)),
-                    momentary=bool(d.get("momentary", False)),
-                    actuationTime=float(d.get("actuationTime", 0.0)),
-                )
-        else:
-            for i in range(8):
-                cfg.digitalOutputs[i] = DigitalOutCfg(
-                    name=raw.get(f"do{i}Name", f"DO{i}"),
-                    normallyOpen=bool(raw.get(f"do{i}normallyOpen", True)),
-                    momentary=bool(raw.get(f"do{i}momentary", False)),
-                    actuationTime=float(raw.get(f"do{i}actuationTime", 0.0)),
-                )
-        if "analogOutputs" in raw and isinstance(raw["analogOutputs"], list):
-            for i in range(min(2, len(raw["analogOutputs"]))):
-                a = raw["analogOutputs"][i] or {}
-                cfg.analogOutputs[i] = AnalogOutCfg(
-                    name=a.get("name", f"AO{i}"),
-                    minV=float(a.get("minV", -10.0)),
-                    maxV=float(a.get("maxV", 10.0)),
-                    startupV=float(a.get("startupV", 0.0)),
-                )
-        else:
-            for i in range(2):
-                cfg.analogOutputs[i] = AnalogOutCfg(
-                    name=raw.get(f"ao{i}Name", f"AO{i}"),
-                    minV=float(raw.get(f"ao{i}Min", -10.0)),
-                    maxV=float(raw.get(f"ao{i}Max", 10.0)),
-                    startupV=float(raw.get(f"ao{i}Default", 0.0)),
-                )
+        # each section is either a list of entries or legacy flat keys
+        for key, n, cls, prefix, fields, flat_keys, spec in (
+            ("analogs", 8, AnalogCfg, "AI", _AI_FIELDS, _AI_KEYS, _AI_SPEC),
+            ("digitalOutputs", 8, DigitalOutCfg, "DO", _DO_FIELDS, _DO_KEYS, _DO_SPEC),
+            ("analogOutputs", 2, AnalogOutCfg, "AO", _AO_FIELDS, _AO_KEYS, _AO_SPEC),
+        ):
+            dst = getattr(cfg, key)
+            entries = raw.get(key)
+            if isinstance(entries, list):
+                for i, e in enumerate(entries[:n]):
+                    dst[i] = _decode(cls, (e or {}).get, fields, spec, f"{prefix}{i}")
+            else:
+                for i in range(n):
+                    dst[i] = _decode(cls, raw.get, flat_keys[i], spec, f"{prefix}{i}")
         return cfg
 
     @staticmethod
     def to_dict(cfg: 'AppConfig') -> dict:
-        return {
-            "boardNum": cfg.boardNum,
-            "sampleRateHz": cfg.sampleRateHz,
-            "blockSize": cfg.blockSize,
-            "aiMode": cfg.aiMode,
-            "analogs": [
-                {"name": a.name, "slope": a.slope, "offset": a.offset, "cutoffHz": a.cutoffHz, "units": a.units}
-                for a in cfg.analogs
-            ],
-            "digitalOutputs": [
-                {"name": d.name, "normallyOpen": d.normallyOpen, "momentary": d.momentary, "actuationTime": d.actuationTime}
-                for d in cfg.digitalOutputs
-            ],
-            "analogOutputs": [
-                {"name": a.name, "minV": a.minV, "maxV": a.maxV, "startupV": a.startupV}
-                for a in cfg.analogOutputs
-            ],
-        }
+        return asdict(cfg)
 
     @staticmethod
     def save(path: str, cfg: 'AppConfig'):
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(ConfigManager.to_dict(cfg), f, indent=2)
+        # orjson serializes (slotted) dataclasses natively, without an intermediate dict tree
+        save_json(path, cfg if orjson is not None else asdict(cfg))
+        ConfigManager._raw_cache.pop(path, None)
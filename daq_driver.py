@@ -1,20 +1,35 @@
 import os
 import ctypes as ct
+import queue
+import threading
+import numpy as np
 from typing import Callable, List
 
 try:
     from mcculw import ul
-    from mcculw.enums import ULRange, DigitalPortType, DigitalIODirection, FunctionType, ScanOptions, AnalogInputMode
+    from mcculw.ul import ULError
+    from mcculw.enums import ULRange, DigitalPortType, DigitalIODirection, FunctionType, ScanOptions, AnalogInputMode, InfoType, BoardInfo, ErrorCode
 except Exception:
-    ul = None; ULRange=DigitalPortType=DigitalIODirection=FunctionType=ScanOptions=AnalogInputMode=None
+    ul = None; ULRange=DigitalPortType=DigitalIODirection=FunctionType=ScanOptions=AnalogInputMode=InfoType=BoardInfo=ErrorCode=None
+    class ULError(Exception): errorcode = None
+
+# Bound once so the per-call paths skip the module/enum attribute lookups
+if ul is not None:
+    _v_in, _v_out, _d_bit_in, _d_bit_out, _d_out = ul.v_in, ul.v_out, ul.d_bit_in, ul.d_bit_out, ul.d_out
+    _BIP10 = ULRange.BIP10VOLTS; _AUX = DigitalPortType.AUXPORT
+else:
+    _v_in = _v_out = _d_bit_in = _d_bit_out = _d_out = _BIP10 = _AUX = None
 
 class DaqError(Exception): pass
 
 class DaqDriver:
     def __init__(self, board_num: int, log_tx: Callable[[str], None], log_rx: Callable[[str], None]):
         self.board = board_num; self.log_tx=log_tx; self.log_rx=log_rx; self.connected=False
-        self.log_ai_reads=False
-        self._scan_running=False; self._scan_low=0; self._scan_high=0; self._scan_num_ch=0; self._scan_rate=0.0; self._scan_count=0; self._scan_last_index=0; self._scan_mem=None
+        self.log_ai_reads=False; self._txv=True  # _txv: log every AO/DO write and DO read-back
+        self._scan_running=False; self._scan_low=0; self._scan_high=0; self._scan_num_ch=0; self._scan_rate=0.0; self._scan_count=0; self._scan_mem=None
+        self._host_buf=None; self._scan_mem_cap=0  # UL/host scan buffers persist across scans until disconnect
+        self._scan_q=queue.SimpleQueue(); self._scan_thr=None; self._scan_stop=threading.Event(); self._scan_err=None
+        self.scan_poll_s=0.005  # how often the drain thread polls the UL ring
         self.valid_ai: List[int] = list(range(8)); self._probed_ai=False
 
     def connect(self):
@@ -28,8 +43,13 @@ class DaqDriver:
         try:
             self.stop_ai_scan()
         finally:
+            self._free_scan_mem()
             self.connected=False; self.log_rx("Disconnected.")
 
+    def set_log_verbose(self, on: bool):
+        """Enable/disable the per-call AO/DO log lines (the messages are not even formatted when off)."""
+        self._txv = bool(on)
+
     def set_ai_mode(self, mode_str: str) -> bool:
         try:
             mode = AnalogInputMode.SINGLE_ENDED if mode_str.upper().startswith("SE") else AnalogInputMode.DIFFERENTIAL
@@ -38,30 +58,55 @@ class DaqDriver:
             self.log_rx(f"AI mode set not supported here: {e}"); return False
 
     def probe_ai_channels(self, max_ch: int = 8) -> list[int]:
-        valid = []
-        for ch in range(max_ch):
-            try:
-                _ = ul.v_in(self.board, ch, ULRange.BIP10VOLTS); valid.append(ch)
-            except Exception as e:
-                if "Invalid A/D channel number" in str(e) or "Error 16" in str(e): continue
-                else: raise
+        # The board reports its A/D channel count (for the current input mode) directly
+        try:
+            n = ul.get_config(InfoType.BOARDINFO, self.board, 0, BoardInfo.NUMADCHANS)
+            valid = list(range(min(max_ch, int(n))))
+        except Exception as e:
+            self.log_rx(f"AI channel count query failed ({e}); probing channels.")
+            valid = self._probe_ai_by_read(max_ch)
         self.valid_ai = valid; self._probed_ai=True
         self.log_rx(f"AI probe: valid channels -> {valid}" if valid else "AI probe: no valid channels detected.")
         return valid
 
+    def _probe_ai_by_read(self, max_ch: int) -> list[int]:
+        valid = []; board = self.board
+        for ch in range(max_ch):
+            try:
+                _ = _v_in(board, ch, _BIP10); valid.append(ch)
+            except ULError as e:
+                if e.errorcode == ErrorCode.BADADCHAN: continue  # 16: invalid A/D channel number
+                raise
+        return valid
+
     def read_ai_volts(self, ch:int)->float:
-        v = ul.v_in(self.board, ch, ULRange.BIP10VOLTS)
+        v = _v_in(self.board, ch, _BIP10)
         if self.log_ai_reads: self.log_rx(f"AI{ch}={v:.6f}V")
         return v
 
     def set_ao_volts(self, ch:int, volts:float):
-        v = max(-10.0, min(10.0, float(volts))); ul.v_out(self.board, ch, ULRange.BIP10VOLTS, v); self.log_tx(f"AO{ch} <- {v:.4f}V")
+        v = max(-10.0, min(10.0, float(volts))); _v_out(self.board, ch, _BIP10, v)
+        if self._txv: self.log_tx(f"AO{ch} <- {v:.4f}V")
 
     def set_do_bit(self, bit:int, state:bool):
-        ul.d_bit_out(self.board, DigitalPortType.AUXPORT, bit, 1 if state else 0); self.log_tx(f"DO{bit} <- {'1' if state else '0'}")
+        _d_bit_out(self.board, _AUX, bit, 1 if state else 0)
+        if self._txv: self.log_tx(f"DO{bit} <- {'1' if state else '0'}")
+
+    def set_do_bits(self, states):
+        """Write DO0..DO7 in one port write (bit i <- states[i]); falls back to per-bit writes."""
+        states = [bool(st) for st in states[:8]]
+        value = sum(1 << i for i, st in enumerate(states) if st)
+        try:
+            _d_out(self.board, _AUX, value)
+        except Exception:
+            for i, st in enumerate(states): self.set_do_bit(i, st)
+            return
+        if self._txv: self.log_tx(f"DO0-{len(states) - 1} <- {''.join('1' if st else '0' for st in states)}")
 
     def get_do_bit(self, bit:int)->bool:
-        val = ul.d_bit_in(self.board, DigitalPortType.AUXPORT, bit); self.log_rx(f"DO{bit}? -> {val}"); return bool(val)
+        val = _d_bit_in(self.board, _AUX, bit)
+        if self._txv: self.log_rx(f"DO{bit}? -> {val}")
+        return bool(val)
 
     def start_ai_scan(self, low_chan: int, high_chan: int, rate_hz: float, block_size: int):
         if self._scan_running:
@@ -70,10 +115,16 @@ class DaqDriver:
         num_ch = max(1, high_chan - low_chan + 1)
         total_count = max(1, int(block_size)) * num_ch
 
-        # Allocate scaled buffer (float volts)
-        self._scan_mem = ul.scaled_win_buf_alloc(total_count)
-        if not self._scan_mem:
-            raise DaqError("Failed to allocate scan buffer")
+        # Scaled buffer (float volts) and its host-side copy target; reused across
+        # start/stop and only regrown (2x headroom) when a scan needs more room
+        if total_count > self._scan_mem_cap:
+            self._free_scan_mem()
+            cap = 2 * total_count
+            self._scan_mem = ul.scaled_win_buf_alloc(cap)
+            if not self._scan_mem:
+                raise DaqError("Failed to allocate scan buffer")
+            self._host_buf = np.empty(cap, dtype=np.float64)
+            self._scan_mem_cap = cap
 
         # MUST be an int; UL will adjust it to the nearest achievable rate
         req_rate = int(round(float(rate_hz)))
@@ -90,7 +141,11 @@ class DaqDriver:
         self._scan_num_ch = num_ch
         self._scan_rate = float(actual_rate if actual_rate else req_rate)
         self._scan_count = total_count
-        self._scan_last_index = 0
+
+        # Drain the UL ring on a worker thread so the GUI tick only collects finished blocks
+        self._scan_q = queue.SimpleQueue(); self._scan_err = None; self._scan_stop.clear()
+        self._scan_thr = threading.Thread(target=self._scan_loop, name="ai-scan-drain", daemon=True)
+        self._scan_thr.start()
 
         self.log_rx(f"AI scan started: ch {low_chan}-{high_chan}, "
                     f"req {rate_hz} Hz -> actual {self._scan_rate:.3f} Hz, block {block_size}")
@@ -99,49 +154,87 @@ class DaqDriver:
 
     def stop_ai_scan(self):
         if not self._scan_running: return
+        self._scan_stop.set()
+        if self._scan_thr is not None:
+            self._scan_thr.join(); self._scan_thr=None
         try:
             ul.stop_background(self.board, FunctionType.AIFUNCTION)
         finally:
-            if self._scan_mem: ul.win_buf_free(self._scan_mem)
-            self._scan_mem=None; self._scan_running=False; self.log_rx("AI scan stopped")
+            self._scan_running=False; self._scan_err=None; self.log_rx("AI scan stopped")
+
+    def _free_scan_mem(self):
+        if self._scan_mem: ul.win_buf_free(self._scan_mem)
+        self._scan_mem=None; self._host_buf=None; self._scan_mem_cap=0
 
     def read_ai_new(self):
+        """Collect every block the drain thread has deinterleaved since the last call.
+
+        Returns (low_chan, num_ch, ch_lists) with ch_lists[i] a fresh list of the new
+        volts for channel low_chan + i (all empty when nothing new arrived), or None when
+        no scan is running.
+        """
         if not self._scan_running:
             return None
+        if self._scan_err is not None:
+            # sticky until stop_ai_scan/start_ai_scan: the drain thread has exited, so
+            # every read reports the failure rather than looking like an idle stream
+            raise DaqError(f"AI scan read failed: {self._scan_err}")
+
+        q = self._scan_q
+        blocks = []
+        while True:
+            try:
+                blocks.append(q.get_nowait())
+            except queue.Empty:
+                break
+        frame = self._scan_num_ch
+        if not blocks:
+            return (self._scan_low, frame, [[] for _ in range(frame)])
+        mat = blocks[0] if len(blocks) == 1 else np.concatenate(blocks, axis=1)
+        return (self._scan_low, frame, mat.tolist())  # one C-level conversion to per-channel lists
+
+    def _scan_loop(self):
+        # Runs on the drain thread; the ring read position lives only here
+        stop = self._scan_stop; put = self._scan_q.put; poll = self.scan_poll_s
+        last = 0
+        try:
+            while not stop.wait(poll):
+                mat, last = self._drain_ring(last)
+                if mat is not None:
+                    put(mat)
+        except Exception as e:
+            self._scan_err = e
 
+    def _drain_ring(self, last):
+        """Copy the whole frames written since `last` and deinterleave them into a (num_ch, n) array."""
         status, cur_count, cur_index = ul.get_status(self.board, FunctionType.AIFUNCTION)
+        frame = self._scan_num_ch; mem = self._scan_mem
         total = self._scan_count
-        last = self._scan_last_index
         new_total = (cur_index - last) % total
-        if new_total == 0:
-            return (self._scan_low, self._scan_num_ch, [[] for _ in range(self._scan_num_ch)])
 
         # Only process **whole frames** so every channel gets the same number of samples
-        frame = self._scan_num_ch
         processed = new_total - (new_total % frame)
         if processed == 0:
             # wait until we have at least one full per-channel sample
-            return (self._scan_low, self._scan_num_ch, [[] for _ in range(self._scan_num_ch)])
-
-        def pull(first, count):
-            arr = (ct.c_double * count)()
-            ul.scaled_win_buf_to_array(self._scan_mem, arr, first, count)
-            return list(arr)
+            return None, last
 
+        # Copy the new samples into the front of the persistent host buffer;
+        # the block returned below is a copy, so it is free again next poll
+        data = self._host_buf[:processed]
+        dst = data.ctypes.data; to_array = ul.scaled_win_buf_to_array; p_double = ct.POINTER(ct.c_double)
         if last + processed <= total:
-            data = pull(last, processed)
+            to_array(mem, ct.cast(dst, p_double), last, processed)
         else:
             tail = total - last
-            head = processed - tail
-            data = pull(last, tail) + pull(0, head)
-
-        # Deinterleave; which channel comes first depends on ring position
-        ch0_offset = last % frame
-        ch_lists = [[] for _ in range(frame)]
-        for i, val in enumerate(data):
-            ch_idx = (ch0_offset + i) % frame
-            ch_lists[ch_idx].append(val)
-
-        # Advance only by what we processed (remainder is left for next tick)
-        self._scan_last_index = (last + processed) % total
-        return (self._scan_low, self._scan_num_ch, ch_lists)
+            to_array(mem, ct.cast(dst, p_double), last, tail)
+            to_array(mem, ct.cast(dst + tail * 8, p_double), 0, processed - tail)
+
+        # Deinterleave. `last` only ever advances by whole frames, modulo a ring that is
+        # itself a whole number of frames (block_size * num_ch), so every read starts on
+        # channel 0 and row r of the (frame, n) view is channel r. One copy gives contiguous rows.
+        if last % frame:
+            raise DaqError(f"AI ring read position {last} is not aligned to {frame}-channel frames")
+        mat = data.reshape(-1, frame).T.copy()
+
+        # Advance only by what we processed (remainder is left for next poll)
+        return mat, (last + processed) % total
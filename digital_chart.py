@@ -2,6 +2,14 @@ from PyQt6 import QtWidgets
 import pyqtgraph as pg
 import numpy as np
 
+from plot_kernels import pack_do_lanes, do_step_path
+
+try:
+    import OpenGL  # noqa: F401  (PyOpenGL; lets pyqtgraph skip the QPainterPath raster path)
+    _HAVE_GL = True
+except Exception:
+    _HAVE_GL = False
+
 class DigitalChartWindow(QtWidgets.QMainWindow):
     def __init__(self):
         super().__init__()
@@ -12,7 +20,9 @@ class DigitalChartWindow(QtWidgets.QMainWindow):
         lay = QtWidgets.QVBoxLayout(cw)
 
         self.plot = pg.PlotWidget()
-        pi = self.plot.getPlotItem()
+        if _HAVE_GL:
+            self.plot.useOpenGL(True)
+        pi = self._pi = self.plot.getPlotItem()  # looked up once; set_data moves its X range every frame
         pi.showGrid(x=True, y=True, alpha=0.2)
         pi.setLabel('bottom', 'Time (s)')
 
@@ -25,56 +35,78 @@ class DigitalChartWindow(QtWidgets.QMainWindow):
 
         lay.addWidget(self.plot)
 
-        # 8 step-mode traces (one plot)
-        self.curves = [self.plot.plot([], [], stepMode=True, pen=pg.mkPen(width=2))
-                       for _ in range(8)]
+        # All 8 lanes drawn as one step trace; a connect mask breaks it between lanes
+        self.curve = self.plot.plot([], [], pen=pg.mkPen(width=2))
+        self.curve.curve.setCacheMode(QtWidgets.QGraphicsItem.CacheMode.DeviceCoordinateCache)
 
         # Vertical placement: top-to-bottom lanes, scaled to 85% band height so neighbors don’t touch
         self.amp = 0.85
-        self.offsets = np.arange(8, dtype=float)[::-1]
+        self.offsets = np.arange(8, dtype=np.float32)[::-1]
 
         # Set a fixed Y range that shows all lanes comfortably
         y_min = self.offsets[-1] - 0.75
         y_max = self.offsets[0] + 0.75
         pi.setYRange(y_min, y_max, padding=0.0)
 
+        self._last_frame = None  # (N, first x, last x) of the last window drawn
+        self._dx_key = None      # (N, rounded window width) the cached edge step was derived for
+        self._dx = 1e-3
+        self._lane_buf = np.empty((8, 0), dtype=np.float32)
+
     def set_data(self, x, states_0_1_history):
         """
         x: array-like of time stamps (N)
-        states_0_1_history: list of 8 arrays (each N) with values 0/1
+        states_0_1_history: list of 8 arrays (each N) with values 0/1, ideally uint8
         """
         x = np.asarray(x, dtype=float)
         N = x.size
         if N == 0:
             return
 
-        # For stepMode=True, X must be len(Y)+1 → build an 'edge' vector
-        if N == 1:
-            dx = 1e-3
-        else:
-            dx = x[-1] - x[-2]
-            if not np.isfinite(dx) or dx <= 0:
-                dx = (x[-1] - x[0]) / max(1, N - 1) if N > 1 else 1e-3
-                if dx <= 0:
-                    dx = 1e-3
-        x_edges = np.empty(N + 1, dtype=float)
-        x_edges[:-1] = x
-        x_edges[-1] = x[-1] + dx
+        # Same window as last frame (no new samples): nothing to redraw
+        frame = (N, float(x[0]), float(x[-1]))
+        if frame == self._last_frame:
+            return
+        self._last_frame = frame
+
+        # The last sample is held for one sample period past x[-1].
+        # The step only changes with the window (span/rate), so validate it once per window shape.
+        dx_key = (N, round(frame[2] - frame[1], 6))
+        if dx_key != self._dx_key:
+            self._dx_key = dx_key
+            if N == 1:
+                dx = 1e-3
+            else:
+                dx = x[-1] - x[-2]
+                if not np.isfinite(dx) or dx <= 0:
+                    dx = (x[-1] - x[0]) / max(1, N - 1) if N > 1 else 1e-3
+                    if dx <= 0:
+                        dx = 1e-3
+            self._dx = dx
+        dx = self._dx
+        x_lo, x_hi = float(x[0]), float(x[-1] + dx)
 
         # Lock X range to the current window (still not draggable)
-        pi = self.plot.getPlotItem()
-        pi.setXRange(x_edges[0], x_edges[-1], padding=0.0)
+        pi = self._pi
+        pi.setXRange(x_lo, x_hi, padding=0.0)
 
+        # Stack the lanes into one reusable (8, N) float32 block (left-padded low if a
+        # lane is short), then map 0/1 to a band centered on each lane's offset in place
+        if self._lane_buf.shape[1] < N:
+            self._lane_buf = np.empty((8, max(N, 2 * self._lane_buf.shape[1])), dtype=np.float32)
+        lanes = self._lane_buf[:, :N]
         for i in range(8):
-            y = np.asarray(states_0_1_history[i], dtype=float)
-
-            # align lengths defensively
-            if y.size != N:
-                n = min(y.size, N)
-                y = y[-n:]
-                xe = x_edges[-(n + 1):]
-            else:
-                xe = x_edges
+            y = np.asarray(states_0_1_history[i], dtype=np.uint8)  # DO history is 0/1
+            n = min(y.size, N)
+            lanes[i, :N - n] = 0
+            lanes[i, N - n:] = y[y.size - n:]
+        pack_do_lanes(lanes, self.offsets, self.amp, lanes)
 
-            # Map 0/1 to a band centered on the lane’s offset
-            self.curves[i].setData(x=xe, y=y * self.amp + self.offsets[i])
+        # A lane only carries information at its edges: draw start, a vertical
+        # step at each transition, and the end of the window (2*T + 2 points)
+        paths = [do_step_path(lanes[i], x, x_lo, x_hi) for i in range(8)]
+        xs = np.concatenate([p[0] for p in paths])
+        ys = np.concatenate([p[1] for p in paths])
+        conn = np.ones(xs.shape[0], dtype=bool)
+        conn[np.cumsum([p[0].shape[0] for p in paths]) - 1] = False  # no segment from a lane's end to the next lane
+        self.curve.setData(x=xs, y=ys, connect=conn, skipFiniteCheck=True)  # 0/1 lanes are always finite
@@ -1,6 +1,50 @@
 import math
 import numpy as np
 
+try:
+    from numba import njit
+except Exception:
+    njit = None
+
+try:
+    from scipy.signal import lfilter
+except Exception:
+    lfilter = None
+
+
+# ---------- kernels (numba when it imports, else scipy's C lfilter, else NumPy/Python) ----------
+
+def _lpf_loop(x, a, oma, yy, y):
+    """y[i] = yy = oma*yy + a*x[i] over x (oma = 1 - a, one FMA per sample); returns the final state."""
+    for i in range(x.shape[0]):
+        yy = oma * yy + a * x[i]
+        y[i] = yy
+    return yy
+
+
+def _lpf_lfilter(x, a, oma, yy, y):
+    # same recurrence as a first-order IIR: b = [a], a = [1, -oma]; the transposed
+    # direct-form state that continues from output yy is oma * yy
+    y[:], _ = lfilter((a,), (1.0, -oma), x, zi=(oma * yy,))
+    return y[-1] if y.shape[0] else yy
+
+
+if njit is not None:
+    _lpf = njit(cache=True, fastmath=True, boundscheck=False)(_lpf_loop)
+elif lfilter is not None:
+    _lpf = _lpf_lfilter
+else:
+    _lpf = _lpf_loop
+
+
+def warm_up():
+    """Compile the numba filter kernel up front (no-op without numba)."""
+    if njit is None:
+        return
+    x = np.zeros(4)
+    _lpf(x, 0.5, 0.5, 0.0, np.empty(4))
+
+
 class OnePoleLPF:
     def __init__(self, cutoff_hz: float, fs_hz: float):
         self.cutoff_hz = max(0.0, float(cutoff_hz))
@@ -10,6 +54,7 @@ class OnePoleLPF:
 
     def _update_alpha(self):
         self.alpha = 1.0 - math.exp(-2.0 * math.pi * self.cutoff_hz / self.fs_hz)
+        self._one_minus_alpha = 1.0 - self.alpha
 
     def set_fs(self, fs_hz: float):
         self.fs_hz = max(1e-6, float(fs_hz))
@@ -29,8 +74,7 @@ class OnePoleLPF:
         if self.y is None:
             self.y = float(x)
             return self.y
-        a = float(self.alpha)
-        self.y = self.y + a * (float(x) - self.y)
+        self.y = self._one_minus_alpha * self.y + self.alpha * float(x)
         return self.y
 
     def process_chunk(self, x_arr: np.ndarray) -> np.ndarray:
@@ -38,22 +82,9 @@ class OnePoleLPF:
         x = np.asarray(x_arr, dtype=float)
         if self.cutoff_hz <= 0.0 or x.size == 0:
             return x
-        y = np.empty_like(x, dtype=float)
-        a = float(self.alpha)
-        yy = self.y
-        if yy is None:
-            # first sample passes through
-            yy = float(x[0])
-            y[0] = yy
-            start = 1
-        else:
-            # filter the first sample, then continue
-            yy = yy + a * (float(x[0]) - yy)
-            y[0] = yy
-            start = 1
-        for i in range(start, x.size):
-            xx = float(x[i])
-            yy = yy + a * (xx - yy)
-            y[i] = yy
-        self.y = yy
+        x = np.ascontiguousarray(x)
+        y = np.empty_like(x)
+        # the first sample ever seen passes through; afterwards every sample is filtered
+        y0 = float(x[0]) if self.y is None else float(self.y)
+        self.y = float(_lpf(x, float(self.alpha), float(self._one_minus_alpha), y0, y))
         return y
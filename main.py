@@ -1,8 +1,8 @@
-import sys, json
+import sys
 import math
 import time
 import numpy as np
-from pid import PIDManager, PIDLoopDef
+from pid import PIDManager, PIDLoopDef, PID_KINDS
 import os
 
 from PyQt6 import QtCore, QtWidgets
@@ -26,10 +26,20 @@ try:
 except Exception:
     DLG_ACCEPTED = QtWidgets.QDialog.Accepted             # PyQt5
 
+# PID table text for a digital output: unknown / off / on (shared, no per-tick formatting)
+_DO_STR = ("—", "0", "1")
+
+# ---- spin boxes for the PID editors (range/decimals/step set in one place) ----
+def _mk_spin(val, lo=0, hi=7):
+    w = QtWidgets.QSpinBox(); w.setRange(lo, hi); w.setValue(int(val)); return w
+
+def _mk_dspin(val, decimals=4, lo=-1e9, hi=1e9, step=0.1):
+    w = QtWidgets.QDoubleSpinBox(); w.setDecimals(decimals); w.setRange(lo, hi); w.setSingleStep(step); w.setValue(float(val)); return w
+
 from typing import Optional
-from config_manager import ConfigManager, AppConfig
+from config_manager import ConfigManager, AppConfig, load_json, save_json
 from daq_driver import DaqDriver, DaqError
-from filters import OnePoleLPF
+from filters import OnePoleLPF, warm_up as warm_up_filters
 from analog_chart import AnalogChartWindow
 from digital_chart import DigitalChartWindow
 from script_runner import ScriptRunner
@@ -39,6 +49,7 @@ from collections import deque
 from acq_worker import AcqWorker
 from combined_chart import CombinedChartWindow
 from bisect import bisect_left
+from itertools import islice, repeat
 
 class PIDSetupDialog(QtWidgets.QDialog):
     COLS = ["Enable","Type","AI ch","OUT ch","Target","P","I","D",
@@ -78,36 +89,28 @@ class PIDSetupDialog(QtWidgets.QDialog):
         def cb(val, checked=True):  # helper
             w = QtWidgets.QCheckBox(); w.setChecked(val); return w
         def combo(val):
-            w = QtWidgets.QComboBox(); w.addItems(["digital","analog"])
+            w = QtWidgets.QComboBox(); w.addItems(PID_KINDS)
             w.setCurrentText(val); return w
-        def spin(v, lo=0, hi=7, step=1):
-            w = QtWidgets.QSpinBox(); w.setRange(lo, hi); w.setValue(int(v)); w.setSingleStep(step); return w
-        def dspin(v, lo=-1e9, hi=1e9, step=0.1):
-            w = QtWidgets.QDoubleSpinBox(); w.setRange(lo, hi); w.setDecimals(4); w.setSingleStep(step); w.setValue(float(v)); return w
 
         items = [
             cb(lp.enabled),
             combo(lp.kind),
-            spin(lp.ai_ch, 0, 7, 1),
-            spin(lp.out_ch, 0, 7 if lp.kind=="digital" else 1, 1),
-            dspin(lp.target),
-            dspin(lp.kp), dspin(lp.ki), dspin(lp.kd)
+            _mk_spin(lp.ai_ch, 0, 7),
+            _mk_spin(lp.out_ch, 0, 7 if lp.kind=="digital" else 1),
+            _mk_dspin(lp.target),
+            _mk_dspin(lp.kp), _mk_dspin(lp.ki), _mk_dspin(lp.kd)
         ]
         for c, w in enumerate(items):
             self.table.setCellWidget(r, c, w)
 
         # ErrMin / ErrMax
-        dsp_emn = QtWidgets.QDoubleSpinBox(); dsp_emn.setDecimals(4); dsp_emn.setRange(-1e9, 1e9); dsp_emn.setSingleStep(0.1)
-        dsp_emx = QtWidgets.QDoubleSpinBox(); dsp_emx.setDecimals(4); dsp_emx.setRange(-1e9, 1e9); dsp_emx.setSingleStep(0.1)
-        dsp_emn.setValue(float(lp.err_min) if lp.err_min is not None else 0.0)
-        dsp_emx.setValue(float(lp.err_max) if lp.err_max is not None else 0.0)
+        dsp_emn = _mk_dspin(lp.err_min if lp.err_min is not None else 0.0)
+        dsp_emx = _mk_dspin(lp.err_max if lp.err_max is not None else 0.0)
         # Use checkbox-like enable? To keep simple, interpret 0==unset if both 0 and user wants no clamp
 
         # IMin / IMax
-        dsp_imn = QtWidgets.QDoubleSpinBox(); dsp_imn.setDecimals(4); dsp_imn.setRange(-1e9, 1e9); dsp_imn.setSingleStep(0.1)
-        dsp_imx = QtWidgets.QDoubleSpinBox(); dsp_imx.setDecimals(4); dsp_imx.setRange(-1e9, 1e9); dsp_imx.setSingleStep(0.1)
-        dsp_imn.setValue(float(lp.i_min) if lp.i_min is not None else 0.0)
-        dsp_imx.setValue(float(lp.i_max) if lp.i_max is not None else 0.0)
+        dsp_imn = _mk_dspin(lp.i_min if lp.i_min is not None else 0.0)
+        dsp_imx = _mk_dspin(lp.i_max if lp.i_max is not None else 0.0)
 
         # place in columns 8..11
         self.table.setCellWidget(r, 8, dsp_emn)
@@ -116,21 +119,13 @@ class PIDSetupDialog(QtWidgets.QDialog):
         self.table.setCellWidget(r, 11, dsp_imx)
 
     def _row_to_def(self, r) -> Optional[dict]:
-        def getw(c): return self.table.cellWidget(r, c)
-        if not self.table.cellWidget(r, 0):  # empty row
+        cell = self.table.cellWidget
+        w_en = cell(r, 0)
+        if not w_en:  # empty row
             return None
-        enabled = getw(0).isChecked()
-        kind = getw(1).currentText()
-        ai = getw(2).value()
-        out = getw(3).value()
-        target = getw(4).value()
-        kp = getw(5).value()
-        ki = getw(6).value()
-        kd = getw(7).value()
-        err_min = self.table.cellWidget(r, 8).value()
-        err_max = self.table.cellWidget(r, 9).value()
-        i_min = self.table.cellWidget(r, 10).value()
-        i_max = self.table.cellWidget(r, 11).value()
+        enabled = w_en.isChecked()
+        kind = cell(r, 1).currentText()
+        ai, out, target, kp, ki, kd, err_min, err_max, i_min, i_max = (cell(r, c).value() for c in range(2, 12))
 
         # normalize zeros to None (no clamp) if both ends are 0
         def nz(x):
@@ -162,8 +157,7 @@ class PIDSetupDialog(QtWidgets.QDialog):
         path, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Load PID.json", "", "JSON (*.json)")
         if not path: return
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                js = json.load(f)
+            js = load_json(path)
             loops = js.get("loops", [])
             self.table.clearContents()
             self.table.setRowCount(max(8, len(loops)))
@@ -177,8 +171,7 @@ class PIDSetupDialog(QtWidgets.QDialog):
         path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Save PID.json", "PID.json", "JSON (*.json)")
         if not path: return
         try:
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump({"loops": self.values()}, f, indent=2)
+            save_json(path, {"loops": self.values()})
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, "PID save error", str(e))
 
@@ -234,6 +227,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.cfg = AppConfig()
         self.daq = None
         self.ai_filters = [OnePoleLPF(0.0, self.cfg.sampleRateHz) for _ in range(8)]
+        warm_up_filters()  # compile the numba filter kernels before acquisition starts
         self.ai_filter_enabled = [False] * 8
         self.ai_hist_x = []
         self.ai_hist_y = [[] for _ in range(8)]
@@ -244,6 +238,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self._history_headroom = 1.25  # 25% margin
         self._rebuild_histories_for_span()  # NEW: create deques sized for current span & sample rate
         self.script_events = []
+        self._cfg_editor = None  # ConfigEditorDialog, created on first Edit Config
 
         self.do_state = [False] * 8  # <-- add: current DO state for plotting
 
@@ -328,7 +323,7 @@ class MainWindow(QtWidgets.QMainWindow):
         # Queues, worker, script
         self._chunk_queue = deque()
         self.acq_thread = None
-        self.script = ScriptRunner(self._set_do)
+        self.script = ScriptRunner(self._set_do, self._set_do_all)
         self.script.tick.connect(self._on_script_tick)
 
         # Apply config to UI and titles
@@ -353,6 +348,7 @@ class MainWindow(QtWidgets.QMainWindow):
         # hook up span sync from both windows (after you create the windows)
         self.analog_win.spanChanged.connect(self._on_span_changed)
         self.combined_win.spanChanged.connect(self._on_span_changed)
+        self.combined_win.renderError.connect(lambda msg: self.log_rx(f"Render error: {msg}"))
 
         # also push the current span into both windows once
         self.analog_win.set_span(self.time_window_s)
@@ -474,6 +470,7 @@ class MainWindow(QtWidgets.QMainWindow):
             "Enable", "Type", "AIch", "OUTch", "AIValue", "Target", "PID u", "OutputValue", "P", "I", "D"
         ])
         self.pid_table.horizontalHeader().setStretchLastSection(True)
+        self.pid_table.verticalScrollBar().valueChanged.connect(lambda _=0: self._pid_update_table_values())
         rgl.addWidget(self.pid_table, 9, 0, 1, 2)
 
         self.ao_sliders=[]; self.ao_labels=[]
@@ -506,11 +503,12 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def _apply_cfg_to_ui(self):
         names = []
-        for i in range(8):
-            self.do_btns[i].setText(f"{i}: {self.cfg.digitalOutputs[i].name}")
-            self.do_chk_no[i].setChecked(self.cfg.digitalOutputs[i].normallyOpen)
-            self.do_chk_mom[i].setChecked(self.cfg.digitalOutputs[i].momentary)
-            self.do_time[i].setValue(self.cfg.digitalOutputs[i].actuationTime)
+        cfg = self.cfg
+        for i, d in enumerate(cfg.digitalOutputs[:8]):
+            self.do_btns[i].setText(f"{i}: {d.name}")
+            self.do_chk_no[i].setChecked(d.normallyOpen)
+            self.do_chk_mom[i].setChecked(d.momentary)
+            self.do_time[i].setValue(d.actuationTime)
         for i in range(2):
             a=self.cfg.analogOutputs[i]; mn=max(-10.0,min(10.0,a.minV)); mx=max(-10.0,min(10.0,a.maxV))
             if mn>mx: mn,mx=mx,mn
@@ -524,37 +522,37 @@ class MainWindow(QtWidgets.QMainWindow):
             [a.name for a in self.cfg.analogs],
             [a.units for a in self.cfg.analogs],
         )
+        # Try a few common layouts; keep whatever matches your Config class.
+        # Which ones this config has doesn't change per row, so probe once.
+        has_douts = hasattr(cfg, "douts")      # e.g., cfg.douts[i].name
+        has_dos = hasattr(cfg, "dos")          # e.g., cfg.dos[i].name
+        has_names = hasattr(cfg, "doNames")    # e.g., list of strings
+        has_flat = hasattr(cfg, "do0Name")     # legacy flat keys
         for i in range(8):
             nm = None
-            # Try a few common layouts; keep whatever matches your Config class
-            if hasattr(self.cfg, "douts"):  # e.g., self.cfg.douts[i].name
-                nm = getattr(self.cfg.douts[i], "name", None)
-            if nm is None and hasattr(self.cfg, "dos"):  # e.g., self.cfg.dos[i].name
-                nm = getattr(self.cfg.dos[i], "name", None)
-            if nm is None and hasattr(self.cfg, "doNames"):  # e.g., list of strings
-                nm = self.cfg.doNames[i]
-            if nm is None and hasattr(self.cfg, "do0Name"):  # legacy flat keys
-                nm = getattr(self.cfg, f"do{i}Name", None)
+            if has_douts:
+                nm = getattr(cfg.douts[i], "name", None)
+            if nm is None and has_dos:
+                nm = getattr(cfg.dos[i], "name", None)
+            if nm is None and has_names:
+                nm = cfg.doNames[i]
+            if nm is None and has_flat:
+                nm = getattr(cfg, f"do{i}Name", None)
             if not nm:
                 nm = f"DO{i}"
             names.append(nm)
 
-            # Update combined chart titles
-            self.combined_win.set_ai_names_units(
-                [a.name for a in self.cfg.analogs],
-                [a.units for a in self.cfg.analogs],
-            )
+        # Update combined chart titles (once per apply, not once per DO row)
+        self.combined_win.set_ai_names_units(
+            [a.name for a in self.cfg.analogs],
+            [a.units for a in self.cfg.analogs],
+        )
 
-            # AO names/units (same logic you used above at creation)
-            ao_names = []
-            ao_units = []
-            for i in range(2):
-                nm = getattr(self.cfg, f"ao{i}Name", f"AO{i}")
-                u = getattr(self.cfg, f"ao{i}Units", "")
-                ao_names.append(nm)
-                ao_units.append(u)
+        # AO names/units (same logic you used above at creation)
+        ao_names = [getattr(cfg, f"ao{i}Name", f"AO{i}") for i in range(2)]
+        ao_units = [getattr(cfg, f"ao{i}Units", "") for i in range(2)]
 
-            self.combined_win.set_ao_names_units(ao_names, ao_units)
+        self.combined_win.set_ao_names_units(ao_names, ao_units)
 
     def _act_apply_config(self):
         """Re-apply the current in-memory config to UI and, if connected, to the device."""
@@ -596,10 +594,8 @@ class MainWindow(QtWidgets.QMainWindow):
             except Exception:
                 valid = list(range(8))
             high = max(valid) if valid else 0
-            for i in range(8):
-                # show/hide curves to match valid channels
-                if hasattr(self.analog_win, "curves"):
-                    self.analog_win.curves[i].setVisible(i in valid)
+            # show/hide curves to match valid channels
+            self.analog_win.set_visible_channels(valid)
 
             # 5) Restart the hardware scan with new rate/block
             actual_rate = self.daq.start_ai_scan(
@@ -671,7 +667,11 @@ class MainWindow(QtWidgets.QMainWindow):
         ConfigManager.save(path,self.cfg); self.log_rx(f"Saved config: {path}")
 
     def _act_edit_cfg(self):
-        dlg=ConfigEditorDialog(self,self.cfg)
+        dlg=self._cfg_editor
+        if dlg is None:
+            dlg=self._cfg_editor=ConfigEditorDialog(self,self.cfg)  # built once, reloaded on later opens
+        else:
+            dlg.load(self.cfg)
         if dlg.exec():
             self.cfg=dlg.updated_config(); self.sample_period = 1.0 / max(1e-6, self.cfg.sampleRateHz); self._apply_cfg_to_ui()
             self._rebuild_histories_for_span()
@@ -682,8 +682,7 @@ class MainWindow(QtWidgets.QMainWindow):
             if not path:
                 return
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                self.script_events = json.load(f)
+            self.script_events = load_json(path)
             self.log_rx(f"Loaded script: {path}")
             if show_editor:
                 self._act_edit_script()
@@ -694,7 +693,7 @@ class MainWindow(QtWidgets.QMainWindow):
         path,_=QtWidgets.QFileDialog.getSaveFileName(self,"Save script.json","script.json","JSON (*.json)")
         if not path: return
         try:
-            with open(path,"w",encoding="utf-8") as f: json.dump(self.script_events,f,indent=2)
+            save_json(path, self.script_events)
             self.log_rx(f"Saved script: {path}")
         except Exception as e: QtWidgets.QMessageBox.critical(self,"Save error",str(e))
 
@@ -756,8 +755,7 @@ class MainWindow(QtWidgets.QMainWindow):
             _ = self.daq.set_ai_mode(self.cfg.aiMode)
             valid = self.daq.probe_ai_channels(8)
             high = max(valid) if valid else 0
-            for i in range(8):
-                self.analog_win.curves[i].setVisible(i in valid)
+            self.analog_win.set_visible_channels(valid)
 
             # Start hardware scan
             actual_rate = self.daq.start_ai_scan(0, high, self.cfg.sampleRateHz, self.cfg.blockSize)
@@ -857,6 +855,14 @@ class MainWindow(QtWidgets.QMainWindow):
             try: self.daq.set_do_bit(idx, state)
             except Exception as e: self.log_rx(f"DO error: {e}")
 
+    def _set_do_all(self, states):
+        # relays missing from a short event keep their current state, as with per-bit writes
+        states = [bool(st) for st in states[:8]] + self.do_state[len(states[:8]):8]
+        self.do_state[:] = states
+        if self.daq and getattr(self.daq,"connected",False):
+            try: self.daq.set_do_bits(states)
+            except Exception as e: self.log_rx(f"DO error: {e}")
+
     def _on_script_tick(self, t, relays):
         for i,st in enumerate(relays[:8]):
             blk=self.do_btns[i].blockSignals(True); self.do_btns[i].setChecked(bool(st)); self.do_btns[i].blockSignals(blk)
@@ -867,52 +873,64 @@ class MainWindow(QtWidgets.QMainWindow):
             if not (self.daq and getattr(self.daq, "connected", False)):
                 return
 
-            # Snapshot histories as lists
-            x_list = list(self.ai_hist_x)
-            if not hasattr(self, "_x0") or self._x0 is None or (x_list and x_list[0] < self._x0): self._x0 = float(x_list[0])
-            if not x_list:
+            # Query window visibility once per tick (isVisible walks the parent chain)
+            show_analog = hasattr(self, "analog_win") and self.analog_win.isVisible()
+            show_digital = hasattr(self, "digital_win") and self.digital_win.isVisible()
+            show_combined = hasattr(self, "combined_win") and self.combined_win.isVisible()
+
+            # Nothing acquired yet (or just reset): skip all the per-channel work
+            if not self.ai_hist_x:
                 return
+            x_first = self.ai_hist_x[0]
+            if not hasattr(self, "_x0") or self._x0 is None or x_first < self._x0: self._x0 = float(x_first)
 
-            ai_list = [list(ch) for ch in self.ai_hist_y]  # 8
-            do_list = [list(ch) for ch in self.do_hist_y]  # 8
-            ao_list = [list(ch) for ch in getattr(self, "ao_hist_y", [[], []])]  # 2
+            # No chart on screen: keep the time origin current but skip the snapshot
+            if not (show_analog or show_digital or show_combined):
+                return
+
+            xh = self.ai_hist_x
 
             # Window by time span
             span = float(self.time_window_s)
-            t_end = x_list[-1]
+            t_end = xh[-1]
             t_start = t_end - span
-            i0 = bisect_left(x_list, t_start)
-            x_cut = x_list[i0:]
-            if not x_cut:
+            # Timebase is uniform in steady state: jump straight to the index and
+            # only fall back to bisect when the guess does not land on the boundary
+            n_all = len(xh)
+            dt = (t_end - xh[0]) / (n_all - 1) if n_all > 1 else 0.0
+            i0 = min(n_all - 1, max(0, math.ceil((t_start - xh[0]) / dt))) if dt > 0 else 0
+            if not (xh[i0] >= t_start and (i0 == 0 or xh[i0 - 1] < t_start)):
+                i0 = bisect_left(xh, t_start)
+            N = n_all - i0
+            if N <= 0:
                 return
-            N = len(x_cut)
-
-            def cut_align(seq, fill=0.0):
-                out = seq[i0:]
-                if len(out) < N:
-                    out = [fill] * (N - len(out)) + out
-                elif len(out) > N:
-                    out = out[-N:]
+
+            def tail(seq, fill, dtype=float):
+                # last N items of a history as a fresh array, left-filled if the history is shorter;
+                # walks from the end so only the visible window is touched, not the whole deque
+                out = np.empty(N, dtype=dtype)
+                k = min(N, len(seq))
+                out[:N - k] = fill
+                out[N - k:] = np.fromiter(islice(reversed(seq), k), dtype=dtype, count=k)[::-1]
                 return out
 
-            ys_cut = [cut_align(ch, fill=np.nan) for ch in ai_list]
-            do_cut = [cut_align(ch, fill=0.0) for ch in do_list]
+            ys_cut = [tail(ch, np.nan) for ch in self.ai_hist_y]
+            do_cut = [tail(ch, 0, np.uint8) for ch in self.do_hist_y]
 
             ao_vals = getattr(self, "ao_value", [0.0, 0.0])
             ao_cut = []
-            for idx, ch in enumerate(ao_list[:2]):
+            for idx, ch in enumerate(getattr(self, "ao_hist_y", [[], []])[:2]):
                 fillv = float(ao_vals[idx]) if idx < len(ao_vals) else 0.0
-                ao_cut.append(cut_align(ch, fill=fillv))
+                ao_cut.append(tail(ch, fillv))
 
-            x_arr = np.asarray(x_cut, dtype=float)
-            if x_arr.size:
-                x_arr = np.asarray(x_cut, dtype=float) - float(self._x0)
+            x_arr = tail(xh, np.nan)
+            x_arr -= float(self._x0)
 
-            if hasattr(self, "analog_win") and self.analog_win.isVisible():
+            if show_analog:
                 self.analog_win.set_data(x_arr, ys_cut)
-            if hasattr(self, "digital_win") and self.digital_win.isVisible():
+            if show_digital:
                 self.digital_win.set_data(x_arr, do_cut)
-            if hasattr(self, "combined_win") and self.combined_win.isVisible():
+            if show_combined:
                 self.combined_win.set_data(x_arr, ys_cut, ao_cut, do_cut)
 
         except Exception as e:
@@ -962,9 +980,6 @@ class MainWindow(QtWidgets.QMainWindow):
                         self.ao_value[int(ch)] = float(volts)
                         if self.daq and getattr(self.daq, "connected", False):
                             self.daq.set_ao_volts(int(ch), float(volts))
-
-                # Update the PID live table after each processed block
-                self._pid_update_table_values()
             except Exception as e:
                 self.log_rx(f"[PID] block apply: {e}")
             # --- end PID block ---
@@ -982,16 +997,23 @@ class MainWindow(QtWidgets.QMainWindow):
                 if ch < num_ch:
                     self.ai_hist_y[ch].extend(arr[ch, :].tolist())
                 else:
-                    self.ai_hist_y[ch].extend([np.nan] * M)
+                    self.ai_hist_y[ch].extend(repeat(np.nan, M))
 
             # DO: repeat current state across this block
             for di in range(8):
-                self.do_hist_y[di].extend([1.0 if self.do_state[di] else 0.0] * M)
+                self.do_hist_y[di].extend(repeat(1 if self.do_state[di] else 0, M))
 
             # AO: repeat current AO volts across this block
             for ai in range(2):
                 val = float(self.ao_value[ai]) if hasattr(self, "ao_value") else 0.0
-                self.ao_hist_y[ai].extend([val] * M)
+                self.ao_hist_y[ai].extend(repeat(val, M))
+
+        # Update the PID live table once per drain (only the last block's values are visible anyway)
+        if batches:
+            try:
+                self._pid_update_table_values()
+            except Exception as e:
+                self.log_rx(f"[PID] table refresh: {e}")
 
     def _loop(self):
         self._drain_chunks(max_batches=8)
@@ -1053,70 +1075,62 @@ class MainWindow(QtWidgets.QMainWindow):
         ])
         self.pid_table.horizontalHeader().setStretchLastSection(True)
 
-        for r, lp in enumerate(loops):
-            # Enable (editable)
-            cb = QtWidgets.QCheckBox()
-            cb.setChecked(bool(lp.enabled))
-            cb.stateChanged.connect(lambda state, row=r: self._pid_on_enable_row(row, state))
-            self.pid_table.setCellWidget(r, 0, cb)
-
-            # Type (editable)
-            typ = QtWidgets.QComboBox()
-            typ.addItems(["digital", "analog"])
-            typ.setCurrentText(lp.kind)
-            typ.currentTextChanged.connect(lambda text, row=r: self._pid_on_type_changed(row, text))
-            self.pid_table.setCellWidget(r, 1, typ)
-
-            # AI ch (editable)
-            sp_ai = QtWidgets.QSpinBox()
-            sp_ai.setRange(0, 7)
-            sp_ai.setValue(int(lp.ai_ch))
-            sp_ai.valueChanged.connect(lambda val, row=r: self._pid_on_ai_changed(row, val))
-            self.pid_table.setCellWidget(r, 2, sp_ai)
-
-            # OUT ch (editable; range depends on type)
-            sp_out = QtWidgets.QSpinBox()
-            if lp.kind == "analog":
-                sp_out.setRange(0, 1)
-            else:
-                sp_out.setRange(0, 7)
-            sp_out.setValue(int(lp.out_ch))
-            sp_out.valueChanged.connect(lambda val, row=r: self._pid_on_out_changed(row, val))
-            self.pid_table.setCellWidget(r, 3, sp_out)
-
-            # AIValue (read-only)
-            it = QtWidgets.QTableWidgetItem("—");
-            it.setFlags(_ro_flags(it.flags()))
-            self.pid_table.setItem(r, 4, it)
-
-            # Target (editable)
-            dsp_tgt = QtWidgets.QDoubleSpinBox()
-            dsp_tgt.setDecimals(4);
-            dsp_tgt.setRange(-1e9, 1e9);
-            dsp_tgt.setSingleStep(0.1)
-            dsp_tgt.setValue(float(lp.target))
-            dsp_tgt.valueChanged.connect(lambda val, row=r: self._pid_on_target_changed(row, val))
-            self.pid_table.setCellWidget(r, 5, dsp_tgt)
-
-            # CurrentError (read-only)
-            it = QtWidgets.QTableWidgetItem("—");
-            it.setFlags(_ro_flags(it.flags()))
-            self.pid_table.setItem(r, 6, it)
-
-            # OutputValue (read-only)
-            it = QtWidgets.QTableWidgetItem("—");
-            it.setFlags(_ro_flags(it.flags()))
-            self.pid_table.setItem(r, 7, it)
-
-            # P/I/D (editable)
-            for c, key in enumerate(["kp", "ki", "kd"], start=8):
-                dsp = QtWidgets.QDoubleSpinBox()
-                dsp.setDecimals(6);
-                dsp.setRange(-1e6, 1e6);
-                dsp.setSingleStep(0.01)
-                dsp.setValue(float(getattr(lp, key)))
-                dsp.valueChanged.connect(lambda val, row=r, k=key: self._pid_on_gain_changed(row, k, val))
-                self.pid_table.setCellWidget(r, c, dsp)
+        # Rebuilding every cell: hold painting and the table's own signals until all rows are in
+        self.pid_table.setUpdatesEnabled(False)
+        blk = self.pid_table.blockSignals(True)
+        try:
+            for r, lp in enumerate(loops):
+                # Enable (editable)
+                cb = QtWidgets.QCheckBox()
+                cb.setChecked(bool(lp.enabled))
+                cb.stateChanged.connect(lambda state, row=r: self._pid_on_enable_row(row, state))
+                self.pid_table.setCellWidget(r, 0, cb)
+
+                # Type (editable)
+                typ = QtWidgets.QComboBox()
+                typ.addItems(PID_KINDS)
+                typ.setCurrentText(lp.kind)
+                typ.currentTextChanged.connect(lambda text, row=r: self._pid_on_type_changed(row, text))
+                self.pid_table.setCellWidget(r, 1, typ)
+
+                # AI ch (editable)
+                sp_ai = _mk_spin(lp.ai_ch, 0, 7)
+                sp_ai.valueChanged.connect(lambda val, row=r: self._pid_on_ai_changed(row, val))
+                self.pid_table.setCellWidget(r, 2, sp_ai)
+
+                # OUT ch (editable; range depends on type)
+                sp_out = _mk_spin(lp.out_ch, 0, 1 if lp.kind == "analog" else 7)
+                sp_out.valueChanged.connect(lambda val, row=r: self._pid_on_out_changed(row, val))
+                self.pid_table.setCellWidget(r, 3, sp_out)
+
+                # AIValue (read-only)
+                it = QtWidgets.QTableWidgetItem("—");
+                it.setFlags(_ro_flags(it.flags()))
+                self.pid_table.setItem(r, 4, it)
+
+                # Target (editable)
+                dsp_tgt = _mk_dspin(lp.target)
+                dsp_tgt.valueChanged.connect(lambda val, row=r: self._pid_on_target_changed(row, val))
+                self.pid_table.setCellWidget(r, 5, dsp_tgt)
+
+                # CurrentError (read-only)
+                it = QtWidgets.QTableWidgetItem("—");
+                it.setFlags(_ro_flags(it.flags()))
+                self.pid_table.setItem(r, 6, it)
+
+                # OutputValue (read-only)
+                it = QtWidgets.QTableWidgetItem("—");
+                it.setFlags(_ro_flags(it.flags()))
+                self.pid_table.setItem(r, 7, it)
+
+                # P/I/D (editable)
+                for c, key in enumerate(["kp", "ki", "kd"], start=8):
+                    dsp = _mk_dspin(getattr(lp, key), 6, -1e6, 1e6, 0.01)
+                    dsp.valueChanged.connect(lambda val, row=r, k=key: self._pid_on_gain_changed(row, k, val))
+                    self.pid_table.setCellWidget(r, c, dsp)
+        finally:
+            self.pid_table.blockSignals(blk)
+            self.pid_table.setUpdatesEnabled(True)
 
     def _pid_update_table_values(self):
         # Build a quick lookup of runtime objects by (kind, ai, out)
@@ -1140,40 +1154,53 @@ class MainWindow(QtWidgets.QMainWindow):
             )
 
         loops = getattr(self.pid_mgr, "loops", [])
-        for r, lp in enumerate(loops):
-            ai_val = "—"
-            pid_val = "—"  # <-- PID Result (P+I+D)
-            out_val = "—"
-            key = (lp.ai_ch, lp.out_ch)
-            hit = rt[lp.kind].get(key)
-
-            if hit:
-                _, ai, u, outv = hit
-
-                # AI value
-                if isinstance(ai, (int, float)) and math.isfinite(ai):
-                    ai_val = f"{float(ai):.4f}"
-
-                # PID Result (control effort, pre-clamp for analog)
-                if isinstance(u, (int, float)) and math.isfinite(u):
-                    pid_val = f"{float(u):.4f}"
-
-                # OutputValue
-                if lp.kind == "digital":
-                    out_val = "—" if outv is None else str(int(bool(outv)))
-                else:
-                    if isinstance(outv, (int, float)) and math.isfinite(outv):
-                        out_val = f"{float(outv):.3f}"
+
+        # Only refresh rows inside the scroll viewport; scrolling triggers a refresh
+        tbl = self.pid_table
+        first = max(0, tbl.rowAt(0))
+        last = tbl.rowAt(tbl.viewport().height() - 1)
+        if last < 0 or last >= len(loops):
+            last = len(loops) - 1
+
+        tbl.setUpdatesEnabled(False)  # one repaint for the whole pass
+        try:
+            for r in range(first, last + 1):
+                lp = loops[r]
+                ai_val = "—"
+                pid_val = "—"  # <-- PID Result (P+I+D)
+                out_val = "—"
+                key = (lp.ai_ch, lp.out_ch)
+                hit = rt[lp.kind].get(key)
+
+                if hit:
+                    _, ai, u, outv = hit
+
+                    # AI value
+                    if isinstance(ai, (int, float)) and math.isfinite(ai):
+                        ai_val = f"{float(ai):.4f}"
+
+                    # PID Result (control effort, pre-clamp for analog)
+                    if isinstance(u, (int, float)) and math.isfinite(u):
+                        pid_val = f"{float(u):.4f}"
+
+                    # OutputValue
+                    if lp.kind == "digital":
+                        out_val = _DO_STR[0 if outv is None else (2 if outv else 1)]
                     else:
-                        out_val = "—"
-
-            for col, txt in [(4, ai_val), (6, pid_val), (7, out_val)]:
-                it = self.pid_table.item(r, col)
-                if it is None:
-                    it = QtWidgets.QTableWidgetItem()
-                    it.setFlags(_ro_flags(QtCore.Qt.ItemFlag.ItemIsSelectable | QtCore.Qt.ItemFlag.ItemIsEnabled))
-                    self.pid_table.setItem(r, col, it)
-                it.setText(txt)
+                        if isinstance(outv, (int, float)) and math.isfinite(outv):
+                            out_val = f"{float(outv):.3f}"
+                        else:
+                            out_val = "—"
+
+                for col, txt in [(4, ai_val), (6, pid_val), (7, out_val)]:
+                    it = self.pid_table.item(r, col)
+                    if it is None:
+                        it = QtWidgets.QTableWidgetItem()
+                        it.setFlags(_ro_flags(QtCore.Qt.ItemFlag.ItemIsSelectable | QtCore.Qt.ItemFlag.ItemIsEnabled))
+                        self.pid_table.setItem(r, col, it)
+                    it.setText(txt)
+        finally:
+            tbl.setUpdatesEnabled(True)
 
 def _pid_rebuild(self):
     self.pid_mgr._rebuild_instances()
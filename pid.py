@@ -1,11 +1,11 @@
 # pid.py
 from dataclasses import dataclass, asdict
 from typing import List, Optional, Tuple, Dict, Any
-import json
 import numpy as np
+from config_manager import load_json, save_json
 
 # ---------- Data model ----------
-@dataclass
+@dataclass(slots=True)
 class PIDLoopDef:
     enabled: bool
     kind: str              # "digital" | "analog"
@@ -24,6 +24,14 @@ class PIDLoopDef:
     i_min: Optional[float] = None       # clamp on integral term (already includes Ki)
     i_max: Optional[float] = None
 
+PID_KINDS = ("digital", "analog")  # loop types, in the order the editors list them
+
+# keys load_file accepts from a loop entry (unknown ones are dropped)
+_LOOP_KEYS = frozenset({
+    "enabled","kind","ai_ch","out_ch","target","kp","ki","kd",
+    "out_min","out_max","err_min","err_max","i_min","i_max"
+})
+
 # ---------- Core ----------
 class _PIDCore:
     def __init__(self, kp: float, ki: float, kd: float, setpoint: float,
@@ -148,20 +156,18 @@ class PIDManager:
         self.loops: List[PIDLoopDef] = []
         self.dloops: List[DigitalPID] = []
         self.aloops: List[AnalogPID] = []
+        # out_ch -> live instance, rebuilt with the loops
+        self.do_by_ch: Dict[int, DigitalPID] = {}
+        self.ao_by_ch: Dict[int, AnalogPID] = {}
 
     # ----- config IO -----
     def load_file(self, path: str):
-        with open(path, "r", encoding="utf-8") as f:
-            js = json.load(f)
+        js = load_json(path)
         cleaned: List[PIDLoopDef] = []
 
-        allowed = {
-            "enabled","kind","ai_ch","out_ch","target","kp","ki","kd",
-            "out_min","out_max","err_min","err_max","i_min","i_max"
-        }
         for item in js.get("loops", []):
             # filter unknown keys so older/newer files don't break
-            d = {k: item[k] for k in allowed if k in item}
+            d = {k: v for k, v in item.items() if k in _LOOP_KEYS}
             # required fallbacks if missing
             d.setdefault("enabled", True)
             d.setdefault("kind", "digital")
@@ -175,13 +181,12 @@ class PIDManager:
         self._rebuild_instances()
 
     def save_file(self, path: str):
-        js = {"loops": [asdict(lp) for lp in self.loops]}
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(js, f, indent=2)
+        save_json(path, {"loops": [asdict(lp) for lp in self.loops]})
 
     # ----- build/reset -----
     def _rebuild_instances(self):
         self.dloops.clear(); self.aloops.clear()
+        self.do_by_ch.clear(); self.ao_by_ch.clear()
         for lp in self.loops:
             if not lp.enabled:
                 continue
@@ -192,11 +197,15 @@ class PIDManager:
                     no = bool(self.mw.cfg.digitalOutputs[lp.out_ch].normallyOpen)
                 except Exception:
                     pass
-                self.dloops.append(DigitalPID(lp, normally_open=no))
+                d = DigitalPID(lp, normally_open=no)
+                self.dloops.append(d)
+                self.do_by_ch[int(lp.out_ch)] = d
             elif lp.kind == "analog":
                 lo = lp.out_min if lp.out_min is not None else -10.0
                 hi = lp.out_max if lp.out_max is not None else  10.0
-                self.aloops.append(AnalogPID(lp, out_limits=(lo, hi)))
+                a = AnalogPID(lp, out_limits=(lo, hi))
+                self.aloops.append(a)
+                self.ao_by_ch[int(lp.out_ch)] = a
 
     def reset_states(self):
         for d in self.dloops: d.reset()
@@ -271,16 +280,10 @@ class PIDManager:
 
     # ----- guards so disabled loops never write outputs -----
     def is_do_controlled(self, ch: int) -> bool:
-        for lp in self.loops:
-            if lp.enabled and lp.kind == "digital" and int(lp.out_ch) == int(ch):
-                return True
-        return False
+        return int(ch) in self.do_by_ch
 
     def is_ao_controlled(self, ch: int) -> bool:
-        for lp in self.loops:
-            if lp.enabled and lp.kind == "analog" and int(lp.out_ch) == int(ch):
-                return True
-        return False
+        return int(ch) in self.ao_by_ch
 
     def apply_loop_updates(self, row: int):
         """Push the edited PIDLoopDef at index 'row' into any live instances that reference it."""
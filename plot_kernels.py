@@ -0,0 +1,187 @@
+# plot_kernels.py
+"""
+Array kernels used by the chart windows to prepare display data:
+  - m4_downsample: first/min/max/last per pixel-wide bin
+  - pack_do_lanes: 0/1 DO lanes -> plotted levels (offset + amp * bit)
+  - do_step_path:  step trace of a DO lane from its transitions only
+
+numba is optional. When it imports, the loop versions below are compiled;
+otherwise equivalent numpy versions are used.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+except Exception:
+    njit = None
+
+
+# ---------- M4 ----------
+
+def _m4_index_loop(y, k, nb, start):
+    # the head (start < k samples) is one more bin: passed through if it has <= 4 samples
+    h = start if start <= 4 else 4
+    idx = np.empty(h + 4 * nb, dtype=np.int64)
+    if start <= 4:
+        for j in range(start):
+            idx[j] = j
+    else:
+        lo = 0
+        hi = 0
+        for j in range(1, start):
+            if y[j] < y[lo]:
+                lo = j
+            if y[j] > y[hi]:
+                hi = j
+        idx[0] = 0
+        idx[1] = min(lo, hi)
+        idx[2] = max(lo, hi)
+        idx[3] = start - 1
+    for b in range(nb):
+        base = start + b * k
+        lo = base
+        hi = base
+        vlo = y[base]
+        vhi = y[base]
+        for j in range(base + 1, base + k):
+            v = y[j]
+            if v < vlo:
+                vlo = v
+                lo = j
+            if v > vhi:
+                vhi = v
+                hi = j
+        o = h + 4 * b
+        idx[o] = base
+        if lo < hi:
+            idx[o + 1] = lo
+            idx[o + 2] = hi
+        else:
+            idx[o + 1] = hi
+            idx[o + 2] = lo
+        idx[o + 3] = base + k - 1
+    return idx
+
+
+def _m4_bins_np(blk):
+    idx = np.empty((blk.shape[0], 4), dtype=np.int64)
+    idx[:, 0] = 0
+    idx[:, 1] = blk.argmin(axis=1)
+    idx[:, 2] = blk.argmax(axis=1)
+    idx[:, 3] = blk.shape[1] - 1
+    idx.sort(axis=1)
+    return idx
+
+
+def _m4_index_np(y, k, nb, start):
+    idx = _m4_bins_np(y[start:].reshape(nb, k))
+    idx += (start + k * np.arange(nb, dtype=np.int64))[:, None]
+    idx = idx.ravel()
+    if start:
+        head = np.arange(start, dtype=np.int64) if start <= 4 else _m4_bins_np(y[None, :start])[0]
+        idx = np.concatenate([head, idx])
+    return idx
+
+
+def m4_downsample(x, y, n_pixels):
+    """M4 reduction: keep first/min/max/last of each pixel-wide bin, in time order.
+
+    Samples are uniformly spaced, so bins are equal sample counts: k = ceil(n / n_pixels)
+    per bin, so at most n_pixels bins. The most recent samples stay bin-aligned; the
+    shorter leftover at the head is one more bin (which then leaves room for it), so the
+    result never exceeds 4 * n_pixels points. Series with NaNs (padding), or that would
+    not get shorter, are returned as-is (the same objects).
+    """
+    n = y.shape[0]
+    if n_pixels <= 0 or n <= 4 * n_pixels or not np.isfinite(y).all():
+        return x, y
+    k = -(-n // n_pixels)             # samples per bin (>= 5)
+    nb = n // k
+    idx = _m4_index(y, k, nb, n - nb * k)
+    if idx.shape[0] >= n:
+        return x, y
+    return x[idx], y[idx]
+
+
+# ---------- DO lane levels ----------
+
+def _pack_do_loop(y2d, offsets, amp, out):
+    for i in range(y2d.shape[0]):
+        off = offsets[i]
+        for j in range(y2d.shape[1]):
+            out[i, j] = off + amp if y2d[i, j] > 0.5 else off
+
+
+def _pack_do_np(y2d, offsets, amp, out):
+    np.greater(y2d, 0.5, out=out)
+    out *= amp
+    out += offsets[:, None]
+
+
+def pack_do_lanes(y2d, offsets, amp, out):
+    """out[i, j] = offsets[i] + amp * (y2d[i, j] > 0.5); out may be y2d itself."""
+    _pack_do(y2d, offsets, float(amp), out)
+
+
+# ---------- DO step path ----------
+
+def _step_path_loop(lane, x, x_lo, x_hi):
+    n = lane.shape[0]
+    m = 0
+    for j in range(1, n):
+        if lane[j] != lane[j - 1]:
+            m += 1
+    xs = np.empty(2 * m + 2, dtype=np.float64)
+    ys = np.empty(2 * m + 2, dtype=np.float32)
+    xs[0] = x_lo
+    ys[0] = lane[0]
+    o = 1
+    for j in range(1, n):
+        if lane[j] != lane[j - 1]:
+            xs[o] = x[j]
+            ys[o] = lane[j - 1]
+            xs[o + 1] = x[j]
+            ys[o + 1] = lane[j]
+            o += 2
+    xs[o] = x_hi
+    ys[o] = lane[n - 1]
+    return xs, ys
+
+
+def _step_path_np(lane, x, x_lo, x_hi):
+    t = np.flatnonzero(lane[1:] != lane[:-1]) + 1  # first sample of each new level
+    m = t.shape[0]
+    xs = np.empty(2 * m + 2, dtype=np.float64)
+    ys = np.empty(2 * m + 2, dtype=np.float32)
+    xs[0], ys[0] = x_lo, lane[0]
+    xs[1:-1:2] = x[t]; ys[1:-1:2] = lane[t - 1]
+    xs[2:-1:2] = x[t]; ys[2:-1:2] = lane[t]
+    xs[-1], ys[-1] = x_hi, lane[-1]
+    return xs, ys
+
+
+def do_step_path(lane, x, x_lo, x_hi):
+    """Step trace through a lane's level changes: start, two points per transition, end."""
+    return _step_path(lane, x, float(x_lo), float(x_hi))
+
+
+if njit is not None:
+    _m4_index = njit(cache=True, fastmath=True, boundscheck=False)(_m4_index_loop)
+    _step_path = njit(cache=True, fastmath=True, boundscheck=False)(_step_path_loop)
+    _pack_do = njit(cache=True, fastmath=True, boundscheck=False)(_pack_do_loop)
+else:
+    _m4_index = _m4_index_np
+    _step_path = _step_path_np
+    _pack_do = _pack_do_np
+
+
+def warm_up():
+    """Compile the numba kernels for the dtypes the charts use (no-op without numba)."""
+    if njit is None:
+        return
+    x = np.arange(64, dtype=np.float64)
+    y = np.zeros(64, dtype=np.float32)
+    m4_downsample(x, y, 4)
+    do_step_path(y, x, 0.0, 64.0)
+    lanes = np.zeros((8, 128), dtype=np.float32)[:, :64]  # charts pass column slices of a wider block
+    pack_do_lanes(lanes, np.arange(8, dtype=np.float32)[::-1], 0.85, lanes)  # offsets are a reversed view
@@ -1,5 +1,10 @@
 from PyQt6 import QtCore, QtWidgets
 
+_CHECKABLE = QtCore.Qt.ItemFlag.ItemIsUserCheckable
+_CHECKED = QtCore.Qt.CheckState.Checked
+_UNCHECKED = QtCore.Qt.CheckState.Unchecked
+_ALIGN_R = QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter
+
 class ScriptEditorDialog(QtWidgets.QDialog):
     def __init__(self, parent, events: list[dict] | None):
         super().__init__(parent)
@@ -17,6 +22,9 @@ class ScriptEditorDialog(QtWidgets.QDialog):
         self.table = QtWidgets.QTableWidget(0, 9, self)
         self.table.setHorizontalHeaderLabels(["Time (s)","DO0","DO1","DO2","DO3","DO4","DO5","DO6","DO7"])
         self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setColumnWidth(0, 100)
+        for c in range(1, 9):
+            self.table.setColumnWidth(c, 60)  # check-box columns; set once, never sized to contents
         layout.addWidget(self.table)
 
         btns = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.StandardButton.Ok | QtWidgets.QDialogButtonBox.StandardButton.Cancel)
@@ -25,17 +33,26 @@ class ScriptEditorDialog(QtWidgets.QDialog):
         self.btn_add.clicked.connect(self._on_add); self.btn_del.clicked.connect(self._on_del); self.btn_sort.clicked.connect(self._on_sort)
 
         if events:
-            for ev in events:
-                self._append_row(ev.get("time", 0.0), ev.get("relays", [False]*8))
+            # size the table once and fill it with painting/signals off, instead of insertRow per event
+            self.table.setUpdatesEnabled(False); self.table.blockSignals(True)
+            try:
+                self.table.setRowCount(len(events))
+                for r, ev in enumerate(events):
+                    self._fill_row(r, ev.get("time", 0.0), ev.get("relays", [False]*8))
+            finally:
+                self.table.blockSignals(False); self.table.setUpdatesEnabled(True)
 
     def _append_row(self, t: float, relays: list[bool]):
         r = self.table.rowCount(); self.table.insertRow(r)
+        self._fill_row(r, t, relays)
+
+    def _fill_row(self, r: int, t: float, relays: list[bool]):
         item_t = QtWidgets.QTableWidgetItem(str(float(t)))
-        item_t.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter)
+        item_t.setTextAlignment(_ALIGN_R)
         self.table.setItem(r, 0, item_t)
         for c in range(8):
-            it = QtWidgets.QTableWidgetItem(); it.setFlags(it.flags() | QtCore.Qt.ItemFlag.ItemIsUserCheckable)
-            it.setCheckState(QtCore.Qt.CheckState.Checked if (relays[c] if c < len(relays) else False) else QtCore.Qt.CheckState.Unchecked)
+            it = QtWidgets.QTableWidgetItem(); it.setFlags(it.flags() | _CHECKABLE)
+            it.setCheckState(_CHECKED if (relays[c] if c < len(relays) else False) else _UNCHECKED)
             self.table.setItem(r, 1+c, it)
 
     def _on_add(self): self._append_row(0.0, [False]*8)
@@ -45,12 +62,11 @@ class ScriptEditorDialog(QtWidgets.QDialog):
     def _on_sort(self): self.table.sortItems(0, QtCore.Qt.SortOrder.AscendingOrder)
 
     def result_events(self) -> list[dict]:
+        item = self.table.item
         evs = []
         for r in range(self.table.rowCount()):
-            t = float(self.table.item(r, 0).text()) if self.table.item(r, 0) else 0.0
-            rel = []
-            for c in range(8):
-                it = self.table.item(r, 1+c)
-                rel.append(it.checkState() == QtCore.Qt.CheckState.Checked if it else False)
+            it_t = item(r, 0)
+            t = float(it_t.text()) if it_t else 0.0
+            rel = [it is not None and it.checkState() == _CHECKED for it in [item(r, c) for c in range(1, 9)]]
             evs.append({"time": t, "relays": rel})
         return evs
@@ -1,11 +1,12 @@
 from PyQt6 import QtCore
-import json, time
+import time
+from config_manager import load_json
 
 class ScriptRunner(QtCore.QObject):
     tick = QtCore.pyqtSignal(float, list)
     finished = QtCore.pyqtSignal()
 
-    def __init__(self, set_do_callable):
+    def __init__(self, set_do_callable, set_do_all_callable=None):
         super().__init__()
         self._events = []
         self._timer = QtCore.QTimer(self)
@@ -15,11 +16,11 @@ class ScriptRunner(QtCore.QObject):
         self._pause_t = 0.0
         self._cursor = 0
         self._set_do = set_do_callable
+        self._set_do_all = set_do_all_callable  # optional: all relays of an event in one call
         self._period_ms = 10
 
     def load_script(self, path: str):
-        with open(path, "r", encoding="utf-8") as f:
-            self._events = json.load(f)
+        self._events = load_json(path)
         self.reset()
 
     def get_events(self):
@@ -61,8 +62,11 @@ class ScriptRunner(QtCore.QObject):
         last_relays = None
         while self._cursor < len(self._events) and t >= float(self._events[self._cursor]["time"]):
             rel = self._events[self._cursor].get("relays", [False]*8)
-            for i, st in enumerate(rel[:8]):
-                self._set_do(i, bool(st))
+            if self._set_do_all is not None:
+                self._set_do_all(rel[:8])
+            else:
+                for i, st in enumerate(rel[:8]):
+                    self._set_do(i, bool(st))
             last_relays = rel
             self._cursor += 1
 
@@ -0,0 +1,102 @@
+import math
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import filters  # noqa: E402
+from filters import OnePoleLPF, _lpf_loop  # noqa: E402
+
+
+def _reference(chunks, a, y=None):
+    """Baseline per-sample recurrence: first sample ever seen passes through, then y += a*(x - y)."""
+    out = []
+    for x in chunks:
+        yc = np.empty(len(x))
+        for i, v in enumerate(x):
+            y = float(v) if y is None else y + a * (float(v) - y)
+            yc[i] = y
+        out.append(yc)
+    return out
+
+
+def _chunks(seed, sizes=(1, 17, 64, 3, 250)):
+    rng = np.random.default_rng(seed)
+    return [rng.standard_normal(n) for n in sizes]
+
+
+@pytest.mark.parametrize("a", [0.0, 0.05, 0.5, 1.0])
+def test_lpf_loop_matches_recurrence_across_chunks(a):
+    chunks = _chunks(1)
+    ref = _reference(chunks, a, y=0.25)
+    yy = 0.25
+    for x, r in zip(chunks, ref):
+        y = np.empty_like(x)
+        yy = _lpf_loop(x, a, 1.0 - a, yy, y)
+        np.testing.assert_allclose(y, r, rtol=1e-12, atol=1e-12)
+        assert yy == pytest.approx(r[-1], abs=1e-12)
+
+
+def test_lpf_loop_alpha_extremes():
+    x = np.arange(5, dtype=np.float64)
+    y = np.empty_like(x)
+    assert _lpf_loop(x, 0.0, 1.0, 3.0, y) == 3.0      # alpha 0 holds the state
+    np.testing.assert_array_equal(y, 3.0)
+    assert _lpf_loop(x, 1.0, 0.0, 3.0, y) == 4.0      # alpha 1 follows the input
+    np.testing.assert_array_equal(y, x)
+
+
+@pytest.mark.parametrize("cutoff_hz", [0.5, 5.0, 40.0, 1e6])   # 1e6 Hz at 100 Hz -> alpha == 1
+def test_process_chunk_matches_recurrence_across_chunks(cutoff_hz):
+    lpf = OnePoleLPF(cutoff_hz, 100.0)
+    a = 1.0 - math.exp(-2.0 * math.pi * cutoff_hz / 100.0)
+    chunks = _chunks(2)
+    for x, r in zip(chunks, _reference(chunks, a)):
+        np.testing.assert_allclose(lpf.process_chunk(x), r, rtol=1e-12, atol=1e-12)
+        assert lpf.y == pytest.approx(r[-1], abs=1e-12)
+
+
+def test_process_chunk_state_matches_single_sample_path():
+    a, b = OnePoleLPF(3.0, 100.0), OnePoleLPF(3.0, 100.0)
+    for x in _chunks(3):
+        y = a.process_chunk(x)
+        np.testing.assert_allclose(y, [b.process(v) for v in x], rtol=1e-12, atol=1e-12)
+
+
+def test_process_chunk_cutoff_zero_passes_through():
+    lpf = OnePoleLPF(0.0, 100.0)                              # alpha 0: filter disabled
+    x = np.array([1.0, -2.0, 3.0])
+    np.testing.assert_array_equal(lpf.process_chunk(x), x)
+    assert lpf.y is None
+
+
+def test_process_chunk_non_contiguous_input():
+    lpf, ref = OnePoleLPF(5.0, 100.0), OnePoleLPF(5.0, 100.0)
+    x = np.random.default_rng(4).standard_normal((2, 40))
+    np.testing.assert_allclose(lpf.process_chunk(x[0, ::2]), ref.process_chunk(x[0, ::2].copy()))
+
+
+def test_kernel_selection():
+    if filters.njit is not None:
+        assert filters._lpf is not _lpf_loop
+    elif filters.lfilter is not None:
+        assert filters._lpf is filters._lpf_lfilter
+    else:
+        assert filters._lpf is _lpf_loop
+
+
+@pytest.mark.parametrize("a", [0.0, 0.02, 0.3, 1.0])
+def test_lfilter_path_matches_loop_across_chunks(a):
+    pytest.importorskip("scipy.signal")
+    from filters import _lpf_lfilter
+    y_loop = y_lf = -1.5
+    for x in _chunks(5, sizes=(1, 9, 128, 2, 300, 33)):
+        out_loop, out_lf = np.empty_like(x), np.empty_like(x)
+        y_loop = _lpf_loop(x, a, 1.0 - a, y_loop, out_loop)
+        y_lf = _lpf_lfilter(x, a, 1.0 - a, y_lf, out_lf)
+        # a wrong zi scaling would show up as a step at the start of each chunk
+        np.testing.assert_allclose(out_lf, out_loop, rtol=1e-12, atol=1e-12)
+        assert y_lf == pytest.approx(y_loop, abs=1e-12)
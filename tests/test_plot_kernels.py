@@ -0,0 +1,40 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plot_kernels import m4_downsample  # noqa: E402
+
+
+@pytest.mark.parametrize("n_pixels", [1, 7, 1000])
+@pytest.mark.parametrize("factor, delta", [(4, 1), (4, 2), (4, 9), (8, -1), (8, -2), (8, -9), (37, 5), (100, -1)])
+def test_m4_output_bounded_by_pixel_width(n_pixels, factor, delta):
+    n = factor * n_pixels + delta
+    if n <= 4 * n_pixels:
+        pytest.skip("not reduced")
+    y = np.random.default_rng(n).standard_normal(n).astype(np.float32)
+    x = np.arange(n, dtype=np.float64)
+    xx, yy = m4_downsample(x, y, n_pixels)
+    assert len(xx) == len(yy) <= 4 * n_pixels
+    assert len(xx) < n
+    assert xx[0] == x[0] and xx[-1] == x[-1]
+    assert yy.min() == y.min() and yy.max() == y.max()
+
+
+def test_m4_just_above_4p_is_reduced():
+    n_pixels = 1000
+    for n in (4001, 4999, 7999):
+        y = np.sin(np.arange(n, dtype=np.float32))
+        xx, _ = m4_downsample(np.arange(n, dtype=np.float64), y, n_pixels)
+        assert len(xx) <= 4 * n_pixels
+
+
+def test_m4_passes_through_short_and_nan_series():
+    x = np.arange(40, dtype=np.float64)
+    y = np.zeros(40, dtype=np.float32)
+    assert m4_downsample(x, y, 10)[0] is x           # n <= 4 * n_pixels
+    y[0] = np.nan
+    assert m4_downsample(x, y, 2)[0] is x            # NaN padding